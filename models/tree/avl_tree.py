@@ -15,11 +15,13 @@ class AVLTree:
     def __init__(self):
         self.root = None
         self._next_id = 1
+        self.version = 0  # 结构版本号，每次修改树时递增（视图据此复用可视化数据）
 
     # ---------- 基础工具 ----------
     def clear(self):
         self.root = None
         self._next_id = 1
+        self.version += 1
 
     def _new_node(self, value: int) -> AVLNode:
         node = AVLNode(self._next_id, int(value))
@@ -241,6 +243,7 @@ class AVLTree:
 
     def insert_with_steps(self, value: int):
         v = int(value)
+        self.version += 1
         steps = []
         steps.append({
             "description": f"开始插入 {v}",
@@ -394,6 +397,7 @@ class AVLTree:
         v = int(value)
         if not self.root:
             return []
+        self.version += 1
         steps = [{
             "description": f"开始删除 {v}",
             "tree": self._snapshot(),
@@ -61,6 +61,7 @@ class BinaryTree:
             
         # 清空当前树
         self.root = None
+        self.version += 1
         
         # 重建树
         for value in data:
@@ -71,6 +72,7 @@ class BinaryTree:
         """初始化一个空的二叉树。"""
         self.root = None
         self.size = 0
+        self.version = 0  # 结构版本号，每次修改树时递增（视图据此复用可视化数据）
     
     def is_empty(self):
         """判断二叉树是否为空。
@@ -125,6 +127,7 @@ class BinaryTree:
         Args:
             value: 插入的节点值
         """
+        self.version += 1
         if self.is_empty():
             self.root = TreeNode(value)
             self.size = 1
@@ -270,6 +273,7 @@ class BinaryTree:
         """清空二叉树"""
         self.root = None
         self.size = 0
+        self.version += 1
     
     def __len__(self):
         """返回二叉树节点数量"""
@@ -389,6 +393,7 @@ class BinaryTree:
             if self.is_empty():
                 self.root = TreeNode(value)
                 self.size = 1
+                self.version += 1
                 return
             else:
                 raise ValueError("路径为空但根节点已存在")
@@ -414,6 +419,7 @@ class BinaryTree:
         else:
             current.right = new_node
         self.size += 1
+        self.version += 1
     
     def _subtree_size(self, node):
         if node is None:
@@ -439,6 +445,7 @@ class BinaryTree:
             removed = self._subtree_size(self.root)
             self.root = None
             self.size = max(0, self.size - removed)
+            self.version += 1
             return True
         # 遍历到目标位置
         current = self.root
@@ -460,4 +467,5 @@ class BinaryTree:
         else:
             parent.right = None
         self.size = max(0, self.size - removed)
+        self.version += 1
         return True
\ No newline at end of file
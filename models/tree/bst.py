@@ -29,6 +29,7 @@ class BST:
         """初始化二叉搜索树"""
         self.root = None
         self.size = 0
+        self.version = 0  # 结构版本号，每次修改树时递增（视图据此复用可视化数据）
         
     def levelorder_traversal(self):
         """层序遍历二叉搜索树
@@ -71,6 +72,7 @@ class BST:
         """
         self.root = self._insert(self.root, value)
         self.size += 1
+        self.version += 1
     
     def _insert(self, node, value):
         """插入节点的递归辅助函数
@@ -282,6 +284,7 @@ class BST:
         """清空二叉搜索树"""
         self.root = None
         self.size = 0
+        self.version += 1
     
     def __len__(self):
         """返回二叉搜索树节点数量"""
@@ -459,6 +462,7 @@ class BST:
             })
         after = None
         self.root = self._delete(self.root, v)
+        self.version += 1
         after = self.get_visualization_data()
         steps.append({"description": "删除完成", "tree": after})
         return steps
\ No newline at end of file
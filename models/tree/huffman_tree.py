@@ -59,6 +59,7 @@ class HuffmanTree:
         self.codes = {}  # 哈夫曼编码表 {字符: 编码}
         self.size = 0
         self.frequencies = {}  # 存储字符频率字典
+        self.version = 0  # 结构版本号，每次修改树时递增（视图据此复用可视化数据）
     
     def is_empty(self):
         """判断哈夫曼树是否为空
@@ -106,6 +107,7 @@ class HuffmanTree:
         if pq:
             self.root = heapq.heappop(pq)
             self.size = self._count_nodes(self.root)
+            self.version += 1
             
             # 生成哈夫曼编码
             self._generate_codes()
@@ -191,6 +193,7 @@ class HuffmanTree:
         if pq:
             self.root = heapq.heappop(pq)
             self.size = self._count_nodes(self.root)
+            self.version += 1
             
             # 生成哈夫曼编码
             self._generate_codes()
@@ -419,6 +422,7 @@ class HuffmanTree:
         self.root = None
         self.codes = {}
         self.size = 0
+        self.version += 1
     
     def __len__(self):
         """返回哈夫曼树节点数量"""
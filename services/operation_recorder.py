@@ -1,6 +1,25 @@
+import bisect
 import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class _Record(NamedTuple):
+    """A single recorded operation (tuple-backed, no per-instance dict)."""
+
+    dsl: str
+    context: str
+    success: bool
+    source: str
+    ts: float
+
+
+class HistoryEntry(NamedTuple):
+    """History entry returned by get_history_entries."""
+
+    dsl: str
+    ts: Optional[float]
+    ctx: str
 
 
 class OperationRecorder:
@@ -15,7 +34,16 @@ class OperationRecorder:
     """
 
     _lock = threading.Lock()
-    _records: Dict[str, List[Dict[str, Any]]] = {"linear": [], "tree": [], "global": []}
+    _records: Dict[str, List[_Record]] = {"linear": [], "tree": [], "global": []}
+    # Successful records per context as parallel (ts, dsl) columns, appended in
+    # time order alongside _records; get_history_columns slices them directly.
+    _columns: Dict[str, Tuple[List[float], List[str]]] = {
+        "linear": ([], []),
+        "tree": ([], []),
+        "global": ([], []),
+    }
+    # Bumped on every append so callers can cache derived views of the history.
+    _generation: int = 0
 
     @classmethod
     def _now(cls) -> float:
@@ -31,16 +59,20 @@ class OperationRecorder:
     ) -> None:
         if not dsl_text or context not in ("linear", "tree", "global"):
             return
+        dsl = dsl_text.strip()
+        ts = cls._now()
         with cls._lock:
-            cls._records[context].append(
-                {
-                    "dsl": dsl_text.strip(),
-                    "context": context,
-                    "success": bool(success),
-                    "source": source,
-                    "ts": cls._now(),
-                }
-            )
+            cls._records[context].append(_Record(dsl, context, bool(success), source, ts))
+            if success:
+                ts_col, dsl_col = cls._columns[context]
+                ts_col.append(ts)
+                dsl_col.append(dsl)
+            cls._generation += 1
+
+    @classmethod
+    def get_generation(cls) -> int:
+        """Return a counter that changes whenever a record is added."""
+        return cls._generation
 
     # ---------- Mapping helpers for button actions ----------
 
@@ -220,16 +252,16 @@ class OperationRecorder:
             # Last global clear
             last_clear_ts: Optional[float] = None
             for r in reversed(cls._records.get("global", [])):
-                if r.get("success") and isinstance(r.get("dsl"), str) and r["dsl"].strip().startswith("clear"):
-                    last_clear_ts = r["ts"]
+                if r.success and r.dsl.startswith("clear"):
+                    last_clear_ts = r.ts
                     break
 
             # Last context create/build
             last_ctx_ts: Optional[float] = None
             for r in reversed(cls._records.get(context, [])):
-                d = (r.get("dsl") or "").strip().lower()
-                if r.get("success") and (d.startswith("create ") or d.startswith("build ")):
-                    last_ctx_ts = r["ts"]
+                d = r.dsl.lower()
+                if r.success and (d.startswith("create ") or d.startswith("build ")):
+                    last_ctx_ts = r.ts
                     break
 
             if last_clear_ts and last_ctx_ts:
@@ -251,15 +283,15 @@ class OperationRecorder:
                     # find boundary line(s)
                     # include global clear if it's at or after since
                     for r in reversed(cls._records.get("global", [])):
-                        if r.get("success") and r.get("ts") and r["ts"] >= since and (r.get("dsl") or "").strip().startswith("clear"):
-                            lines.append(r["dsl"])  # include boundary clear
+                        if r.success and r.ts and r.ts >= since and r.dsl.startswith("clear"):
+                            lines.append(r.dsl)  # include boundary clear
                             break
                 for r in cls._records.get(ctx, []):
-                    if not r.get("success"):
+                    if not r.success:
                         continue
-                    if since is not None and r.get("ts", 0) < since:
+                    if since is not None and r.ts < since:
                         continue
-                    lines.append(r["dsl"])
+                    lines.append(r.dsl)
             return lines
 
         if not context:
@@ -278,6 +310,7 @@ class OperationRecorder:
     # ---------- History with timestamps ----------
     @classmethod
     def _format_ts(cls, ts: Optional[float]) -> str:
+        """Format ts as HH:MM:SS ("-" if missing); output is plain ASCII and needs no escaping."""
         try:
             if ts is None:
                 return "-"
@@ -286,22 +319,23 @@ class OperationRecorder:
             return str(ts or "-")
 
     @classmethod
-    def get_history_entries(cls, context: Optional[str]) -> List[Dict[str, Any]]:
-        """Return list of entries {dsl, ts, ctx} since boundary.
+    def get_history_entries(cls, context: Optional[str], limit: Optional[int] = None) -> List[HistoryEntry]:
+        """Return list of HistoryEntry(dsl, ts, ctx) since boundary.
 
         If context is None, merge linear and tree entries and include a single
         global clear if it is newer than the earlier boundary.
+        If limit is given, only the most recent `limit` entries are returned.
         """
-        def _collect_ctx(ctx: str, since: Optional[float]) -> List[Dict[str, Any]]:
-            entries: List[Dict[str, Any]] = []
+        def _collect_ctx(ctx: str, since: Optional[float]) -> List[HistoryEntry]:
+            entries: List[HistoryEntry] = []
             with cls._lock:
                 # include context entries since boundary
                 for r in cls._records.get(ctx, []):
-                    if not r.get("success"):
+                    if not r.success:
                         continue
-                    if since is not None and r.get("ts", 0) < since:
+                    if since is not None and r.ts < since:
                         continue
-                    entries.append({"dsl": r.get("dsl", ""), "ts": r.get("ts"), "ctx": ctx})
+                    entries.append(HistoryEntry(r.dsl, r.ts, ctx))
             return entries
 
         if not context:
@@ -318,12 +352,12 @@ class OperationRecorder:
             if min_since is not None:
                 with cls._lock:
                     for r in reversed(cls._records.get("global", [])):
-                        if r.get("success") and r.get("ts") and r["ts"] >= min_since and (r.get("dsl") or "").strip().startswith("clear"):
-                            entries.append({"dsl": r.get("dsl", ""), "ts": r.get("ts"), "ctx": "global"})
+                        if r.success and r.ts and r.ts >= min_since and r.dsl.startswith("clear"):
+                            entries.append(HistoryEntry(r.dsl, r.ts, "global"))
                             break
             # sort by timestamp ascending
-            entries.sort(key=lambda e: (e.get("ts") or 0))
-            return entries
+            entries.sort(key=lambda e: (e.ts or 0))
+            return cls._tail(entries, limit)
 
         # single-context collection
         since = cls._last_boundary_ts(context)
@@ -331,10 +365,81 @@ class OperationRecorder:
         if since is not None:
             with cls._lock:
                 for r in reversed(cls._records.get("global", [])):
-                    if r.get("success") and r.get("ts") and r["ts"] >= since and (r.get("dsl") or "").strip().startswith("clear"):
-                        entries.insert(0, {"dsl": r.get("dsl", ""), "ts": r.get("ts"), "ctx": "global"})
+                    if r.success and r.ts and r.ts >= since and r.dsl.startswith("clear"):
+                        entries.insert(0, HistoryEntry(r.dsl, r.ts, "global"))
                         break
-        entries.sort(key=lambda e: (e.get("ts") or 0))
+        entries.sort(key=lambda e: (e.ts or 0))
+        return cls._tail(entries, limit)
+
+    @classmethod
+    def _column_slice(cls, ctx: str, since: Optional[float]) -> Tuple[List[float], List[str], List[str]]:
+        """(ts, ctx, dsl) columns of ctx since the boundary, found by bisecting the ts column."""
+        with cls._lock:
+            cols = cls._columns.get(ctx)
+            if cols is None:
+                return [], [], []
+            ts_col, dsl_col = cols
+            start = 0 if since is None else bisect.bisect_left(ts_col, since)
+            ts_list = ts_col[start:]
+            dsl_list = dsl_col[start:]
+        return ts_list, [ctx] * len(ts_list), dsl_list
+
+    @classmethod
+    def _boundary_clear_columns(cls, since: Optional[float]) -> Tuple[List[float], List[str], List[str]]:
+        """Columns holding the latest global clear at or after since (empty if none)."""
+        if since is None:
+            return [], [], []
+        with cls._lock:
+            for r in reversed(cls._records.get("global", [])):
+                if r.success and r.ts and r.ts >= since and r.dsl.startswith("clear"):
+                    return [r.ts], ["global"], [r.dsl]
+        return [], [], []
+
+    @classmethod
+    def get_history_columns(
+        cls, context: Optional[str], limit: Optional[int] = None
+    ) -> Tuple[List[float], List[str], List[str]]:
+        """Same entries as get_history_entries, as parallel (ts, ctx, dsl) lists.
+
+        Built from the per-context columns without creating per-entry tuples.
+        """
+        if not context:
+            since_linear = cls._last_boundary_ts("linear")
+            since_tree = cls._last_boundary_ts("tree")
+            if since_linear is not None and since_tree is not None:
+                min_since = min(since_linear, since_tree)
+            else:
+                min_since = since_linear or since_tree
+            # same concatenation order as get_history_entries, so the stable sort below ties the same way
+            parts = [
+                cls._column_slice("linear", since_linear),
+                cls._column_slice("tree", since_tree),
+                cls._boundary_clear_columns(min_since),
+            ]
+        else:
+            since = cls._last_boundary_ts(context)
+            parts = [cls._boundary_clear_columns(since), cls._column_slice(context, since)]
+
+        ts_all: List[float] = []
+        ctx_all: List[str] = []
+        dsl_all: List[str] = []
+        for ts_col, ctx_col, dsl_col in parts:
+            ts_all += ts_col
+            ctx_all += ctx_col
+            dsl_all += dsl_col
+        order = sorted(range(len(ts_all)), key=ts_all.__getitem__)
+        if limit is not None and len(order) > limit:
+            order = order[-limit:]
+        return (
+            [ts_all[i] for i in order],
+            [ctx_all[i] for i in order],
+            [dsl_all[i] for i in order],
+        )
+
+    @staticmethod
+    def _tail(entries: List[HistoryEntry], limit: Optional[int]) -> List[HistoryEntry]:
+        if limit is not None and len(entries) > limit:
+            return entries[-limit:]
         return entries
 
     @classmethod
@@ -342,9 +447,9 @@ class OperationRecorder:
         entries = cls.get_history_entries(context)
         lines: List[str] = []
         for e in entries:
-            ts = cls._format_ts(e.get("ts"))
-            ctx = e.get("ctx")
-            dsl = e.get("dsl") or ""
+            ts = cls._format_ts(e.ts)
+            ctx = e.ctx
+            dsl = e.dsl
             # For combined view, include context tag; otherwise omit
             if context is None:
                 tag = f"[{ctx}] " if ctx else ""
@@ -5,11 +5,12 @@
 统一主题与样式（QSS）
 """
 
+import functools
+
 # 应用级样式表（浅色主题）
 DEFAULT_BASE_FONT_PX = 13
 
-def _build_qss(base_font_px: int):
-    px = max(11, min(22, int(base_font_px or DEFAULT_BASE_FONT_PX)))
+def _build_qss(base_font_px):
     qss = """
 /* 全局字体与背景 */
 QWidget {
@@ -103,8 +104,16 @@ QTabWidget::pane { border: 1px solid #e5e7eb; border-radius: 8px; }
 QTabBar::tab { background: #ffffff; border: 1px solid #e5e7eb; border-radius: 6px; padding: 6px 12px; margin: 2px; }
 QTabBar::tab:selected { background: #e5f0ff; }
 """
+    if base_font_px is None:
+        # 不在样式表中固定字号，由应用字体（QApplication.setFont）决定
+        return qss.replace("  font-size: __BASE_FONT_PX__px;\n", "")
+    px = max(11, min(22, int(base_font_px or DEFAULT_BASE_FONT_PX)))
     return qss.replace("__BASE_FONT_PX__", str(px))
 
+@functools.lru_cache(maxsize=16)
 def get_app_qss(base_font_px: int = DEFAULT_BASE_FONT_PX):
-    """返回应用级样式表字符串，支持基础字体像素大小参数化"""
+    """返回应用级样式表字符串，支持基础字体像素大小参数化（按像素大小缓存）
+
+    base_font_px 为 None 时返回不含全局字号的样式表，字号交由应用字体控制。
+    """
     return _build_qss(base_font_px)
\ No newline at end of file
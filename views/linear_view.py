@@ -8,10 +8,64 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QComboBox, QLineEdit, QGroupBox, QFormLayout, QSpinBox,
                              QMessageBox, QSplitter, QFrame, QScrollArea, QInputDialog, QTextEdit, QPlainTextEdit, QSlider, QSizePolicy)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QVariantAnimation, QEasingCurve, QEvent
-from PyQt5.QtGui import QFont, QPainter, QPen, QColor, QPainterPath, QFontMetrics
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QVariantAnimation, QEasingCurve, QEvent, QPointF, QRect
+from PyQt5.QtGui import QFont, QPainter, QPen, QColor, QPainterPath, QFontMetrics, QPolygonF, QStaticText
+from collections import OrderedDict
 import math
 
+# 画布绘制用颜色常量（避免每次重绘逐格重复构造 QColor）
+_COL_ORANGE = QColor(255, 152, 0)
+_COL_HL_BG = QColor(255, 224, 178)
+_COL_BLUE = QColor(0, 122, 204)
+_COL_BLUE_BG = QColor(190, 220, 255)
+_COL_HOVER = QColor(30, 144, 255)
+_COL_HOVER_BG = QColor(230, 245, 255)
+_COL_ARROW = QColor(66, 66, 66)
+_COL_PLACEHOLDER = QColor(100, 100, 100)
+# 画布绘制用画笔常量
+_PEN_CELL = QPen(Qt.black, 2)
+_PEN_TEXT = QPen(Qt.black)
+_PEN_HL = QPen(_COL_ORANGE, 2)
+_PEN_SEL = QPen(_COL_BLUE, 2)
+_PEN_HOVER = QPen(_COL_HOVER, 2)
+_PEN_ARROW = QPen(_COL_ARROW)
+_PEN_ARROW_BOLD = QPen(_COL_ARROW, 2)
+
+# 箭头两翼相对线段方向的偏转角（±30°）的余弦/正弦
+_ARROW_COS = math.cos(math.pi / 6)
+_ARROW_SIN = math.sin(math.pi / 6)
+
+
+def _arrowhead_points(sx, sy, ex, ey, ah):
+    """计算由 (sx, sy) 指向 (ex, ey) 的箭头两翼端点
+
+    用单位方向向量与固定偏转角的旋转代替 atan2/cos/sin 三角函数调用。
+
+    Returns:
+        tuple: (ax1, ay1, ax2, ay2) 整数坐标
+    """
+    dx = ex - sx
+    dy = ey - sy
+    length = math.hypot(dx, dy)
+    if length == 0:
+        ux, uy = 1.0, 0.0
+    else:
+        ux, uy = dx / length, dy / length
+    c = ah * _ARROW_COS
+    s = ah * _ARROW_SIN
+    ax1 = int(ex - (ux * c + uy * s))
+    ay1 = int(ey - (uy * c - ux * s))
+    ax2 = int(ex - (ux * c - uy * s))
+    ay2 = int(ey - (uy * c + ux * s))
+    return ax1, ay1, ax2, ay2
+
+
+# 静态文本缓存上限（索引、元素值等短文本）
+_STATIC_TEXT_CACHE_SIZE = 512
+
+# 高亮渐显底色：透明度量化为 16 档，按 alpha >> 4 查表
+_HL_BG_LUT = [QColor(255, 224, 178, (i << 4) | 0x0F) for i in range(16)]
+
 
 class LinearView(QWidget):
     """线性结构视图类，用于展示和操作线性数据结构"""
@@ -416,6 +470,8 @@ class LinearView(QWidget):
             self._update_splitter_sizes()
         except Exception:
             pass
+        # 画布字体缩放取决于顶层窗口宽度，此处同步刷新其缓存
+        self.canvas.refresh_scale()
     
     def _clear_dsl_input(self):
         """清空DSL输入与控制台"""
@@ -1406,7 +1462,13 @@ class LinearCanvas(QWidget):
         # 高亮相关（改为属性以触发渐隐渐显动画）
         self._highlighted_index = None
         self.highlight_opacity = 0.0
-        self._highlight_anim = None
+        # 渐显动画只创建一次，每次高亮变化时重置区间后重新启动
+        self._highlight_anim = QVariantAnimation(self)
+        self._highlight_anim.setDuration(400)
+        self._highlight_anim.setStartValue(0.0)
+        self._highlight_anim.setEndValue(1.0)
+        self._highlight_anim.setEasingCurve(QEasingCurve.OutCubic)
+        self._highlight_anim.valueChanged.connect(self._on_highlight_value)
         # 链表插入/删除动画状态
         self.step_type = None
         self.linked_aux = None
@@ -1432,6 +1494,42 @@ class LinearCanvas(QWidget):
         self.hovered_index = None
         self.selected_index = None
 
+        # 当前绘制事件的脏区域横向/纵向范围（场景坐标），None 表示全部重绘
+        self._dirty_x_range = None
+        self._dirty_y_range = None
+        # 字体缩放比例缓存：仅在尺寸变化/显示时重新计算，绘制路径直接读取
+        self._scale_cached = 1.0
+        # 文本缓存：元素值字符串随 update_data 失效，索引标签按需扩展
+        self._str_data = None
+        self._index_strs = []
+        # 值文本最大宽度缓存：(值字符串列表, 缩放比例, 宽度)
+        self._value_w_cache = None
+        # 预排版文本缓存（字符串 -> QStaticText），按最近使用淘汰
+        self._static_text_cache = OrderedDict()
+
+    def _in_dirty(self, x, w):
+        """判断横向区间 [x, x + w] 是否与当前脏区域相交"""
+        rng = self._dirty_x_range
+        if rng is None:
+            return True
+        return x + w >= rng[0] and x <= rng[1]
+
+    def _in_dirty_y(self, y, h):
+        """判断纵向区间 [y, y + h] 是否与当前脏区域相交"""
+        rng = self._dirty_y_range
+        if rng is None:
+            return True
+        return y + h >= rng[0] and y <= rng[1]
+
+    def _value_text_width(self, fm):
+        """值文本的最大绘制宽度（随数据与字体缩放缓存）：较长的值会超出单元格，剔除时需计入"""
+        strs = self._value_strs()
+        cached = self._value_w_cache
+        if cached is None or cached[0] is not strs or cached[1] != self._scale_cached:
+            width = max(map(fm.horizontalAdvance, strs), default=0)
+            cached = self._value_w_cache = (strs, self._scale_cached, width)
+        return cached[2]
+
     # ---- 字体缩放工具 ----
     def _font_scale(self):
         try:
@@ -1445,12 +1543,78 @@ class LinearCanvas(QWidget):
             scale = 1.6
         return scale
 
-    def _scaled_font(self, base_pt):
+    def _value_strs(self):
+        """返回 self.data 各元素的显示字符串，在两次 update_data 之间的重绘中复用"""
+        if self._str_data is None:
+            self._str_data = list(map(str, self.data or []))
+        return self._str_data
+
+    def _index_labels(self, n):
+        """返回至少包含 n 个索引标签字符串的列表"""
+        strs = self._index_strs
+        if len(strs) < n:
+            strs.extend(map(str, range(len(strs), n)))
+        return strs
+
+    @staticmethod
+    def _cell_styles(hl_brush):
+        """返回按样式编号索引的 (画笔, 画刷)：0 默认、1 悬停、2 选中、3 高亮"""
+        return ((_PEN_CELL, Qt.NoBrush),
+                (_PEN_HOVER, _COL_HOVER_BG),
+                (_PEN_SEL, _COL_BLUE_BG),
+                (_PEN_HL, hl_brush))
+
+    def _special_styles(self):
+        """返回 {索引: 样式编号}，仅包含悬停/选中/高亮的少量索引（高亮 > 选中 > 悬停）"""
+        special = {}
+        for idx, style in ((self.hovered_index, 1), (self.selected_index, 2), (self.highlighted_index, 3)):
+            if isinstance(idx, int):
+                special[idx] = style
+        return special
+
+    def _highlight_brush(self):
+        """按当前渐显进度返回高亮底色（每次绘制计算一次）"""
+        try:
+            alpha = max(0, min(255, int(60 + 195 * self.highlight_opacity)))
+        except Exception:
+            alpha = 255
+        return _HL_BG_LUT[min(15, alpha >> 4)]
+
+    def _stext(self, text):
+        """返回 text 对应的 QStaticText（带 LRU 淘汰的缓存）"""
+        cache = self._static_text_cache
+        st = cache.get(text)
+        if st is None:
+            st = QStaticText(text)
+            cache[text] = st
+            if len(cache) > _STATIC_TEXT_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(text)
+        return st
+
+    def _draw_static(self, painter, x, baseline_y, text, ascent):
+        """以基线坐标绘制缓存的静态文本（drawStaticText 以左上角定位）"""
+        painter.drawStaticText(x, baseline_y - ascent, self._stext(text))
+
+    def refresh_scale(self):
+        """重新计算并缓存字体缩放比例"""
         try:
-            size_pt = int(round((base_pt or 12) * self._font_scale()))
+            self._scale_cached = self._font_scale()
         except Exception:
-            size_pt = int(base_pt or 12)
+            self._scale_cached = 1.0
+
+    def _scaled_font(self, base_pt):
+        size_pt = int(round((base_pt or 12) * self._scale_cached))
         return QFont("Arial", size_pt)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh_scale()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_scale()
     
     def update_data(self, data):
         """更新数据
@@ -1474,6 +1638,7 @@ class LinearCanvas(QWidget):
             self.persist_delete_arrow = False
             self.persist_delete_index = None
             self.linked_aux_del = None
+            self._str_data = None
             return
             
         self.structure_type = data.get("type")
@@ -1541,6 +1706,9 @@ class LinearCanvas(QWidget):
             self.persist_prev_arrow = False
             self.persist_insert_index = None
         
+        # 元素值已变化，失效字符串缓存
+        self._str_data = None
+        
         # 根据数据量调整画布大小
         self._adjust_canvas_size()
         
@@ -1599,7 +1767,7 @@ class LinearCanvas(QWidget):
         if (self.structure_type != "array_list" or self.capacity is None) and (not self.data or len(self.data) == 0):
             painter = QPainter(self)
             painter.setRenderHint(QPainter.Antialiasing)
-            painter.setPen(QPen(QColor(100, 100, 100)))
+            painter.setPen(QPen(_COL_PLACEHOLDER))
             painter.setFont(self._scaled_font(14))
             painter.drawText(self.rect(), Qt.AlignCenter, "暂无数据可显示")
             return
@@ -1607,6 +1775,13 @@ class LinearCanvas(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.TextAntialiasing)
+        # 仅重绘脏区域：裁剪到 event.rect()，并记录其场景坐标范围供单元格剔除
+        dirty = event.rect()
+        painter.setClipRect(dirty)
+        x0, y0 = self._to_scene(dirty.topLeft())
+        x1, y1 = self._to_scene(dirty.bottomRight())
+        self._dirty_x_range = (x0, x1 + 1)
+        self._dirty_y_range = (y0, y1 + 1)
         # 应用平移与缩放变换（平滑缩放与拖拽平移）
         try:
             painter.translate(self.pan_tx, self.pan_ty)
@@ -1634,15 +1809,15 @@ class LinearCanvas(QWidget):
         # 设置字体
         font = self._scaled_font(12)
         painter.setFont(font)
+        fm = painter.fontMetrics()
+        asc = fm.ascent()
         # 根据字体缩放比例同步调整单元格尺寸与间距
-        try:
-            scale = self._font_scale()
-        except Exception:
-            scale = 1.0
+        scale = self._scale_cached
         cell_width = int(60 * scale)
         cell_height = int(40 * scale)
         start_x = int(50 * scale)
         start_y = int(100 * scale)
+        text_off = int(20 * scale)
         
         # 扩容阶段：在“创建新空表/复制元素”时同时绘制旧表与新表
         dual = getattr(self, 'dual_arrays', None)
@@ -1655,20 +1830,30 @@ class LinearCanvas(QWidget):
             total_old = old_capacity if old_capacity is not None else len(old_data)
             painter.drawText(start_x, start_y - int(30 * scale), "旧表")
             painter.drawText(start_x + int(120 * scale), start_y - int(30 * scale), f"容量: {old_capacity}  大小: {old_size}")
+            index_strs = self._index_labels(total_old)
+            # 文本可能超出单元格：标签/值的剔除宽度取单元格与最宽文本右端的较大者
+            idx_span = max(cell_width, text_off + fm.horizontalAdvance(index_strs[total_old - 1])) if total_old else cell_width
+            val_span = max(cell_width, text_off + max((fm.horizontalAdvance(str(v)) for v in old_data if v is not None), default=0))
             for i in range(total_old):
                 x = start_x + i * cell_width
-                painter.drawText(x + int(20 * scale), start_y - int(10 * scale), str(i))
+                if not self._in_dirty(x, idx_span):
+                    continue
+                self._draw_static(painter, x + text_off, start_y - int(10 * scale), index_strs[i], asc)
+            # 旧表单元格样式一致：统一设置一次画笔/画刷后绘制全部边框，再绘制有数据槽位的值
+            painter.setPen(_PEN_CELL)
+            painter.setBrush(Qt.NoBrush)
             for i in range(total_old):
                 x = start_x + i * cell_width
-                painter.setPen(QPen(Qt.black, 2))
-                painter.setBrush(Qt.NoBrush)
+                if not self._in_dirty(x, cell_width):
+                    continue
                 painter.drawRect(x, start_y, cell_width, cell_height)
-                val = old_data[i] if i < len(old_data) else None
-                if val is None:
-                    painter.setPen(QPen(QColor(150, 150, 150)))
-                    painter.drawText(x + int(20 * scale), start_y + int(25 * scale), "")
-                else:
-                    painter.setPen(QPen(Qt.black))
+            painter.setPen(_PEN_TEXT)
+            for i in range(min(total_old, len(old_data))):
+                x = start_x + i * cell_width
+                if not self._in_dirty(x, val_span):
+                    continue
+                val = old_data[i]
+                if val is not None:
                     painter.drawText(x + int(20 * scale), start_y + int(25 * scale), str(val))
 
             # ---- 绘制新表（下方） ----
@@ -1680,26 +1865,45 @@ class LinearCanvas(QWidget):
             total_new = new_capacity if new_capacity is not None else len(new_data)
             painter.drawText(start_x, new_y - int(30 * scale), "新表")
             painter.drawText(start_x + int(120 * scale), new_y - int(30 * scale), f"容量: {new_capacity}  大小: {new_size}")
+            index_strs = self._index_labels(total_new)
+            idx_span = max(cell_width, text_off + fm.horizontalAdvance(index_strs[total_new - 1])) if total_new else cell_width
+            val_span = max(cell_width, text_off + max((fm.horizontalAdvance(str(v)) for v in new_data if v is not None), default=0))
             for i in range(total_new):
                 x = start_x + i * cell_width
-                painter.drawText(x + int(20 * scale), new_y - int(10 * scale), str(i))
-            for i in range(total_new):
+                if not self._in_dirty(x, idx_span):
+                    continue
+                self._draw_static(painter, x + text_off, new_y - int(10 * scale), index_strs[i], asc)
+            with_val = min(total_new, len(new_data))
+            # 新表当前填充的格子以浅色标识；仅在填充状态变化时切换画笔/画刷
+            cur_filled = None
+            for i in range(with_val):
                 x = start_x + i * cell_width
-                # 新表当前填充的格子以浅色标识
-                is_filled = (i < len(new_data)) and (new_data[i] is not None)
-                if is_filled:
-                    painter.setPen(QPen(QColor(0, 122, 204), 2))
-                    painter.setBrush(QColor(190, 220, 255))
-                else:
-                    painter.setPen(QPen(Qt.black, 2))
-                    painter.setBrush(Qt.NoBrush)
+                if not self._in_dirty(x, cell_width):
+                    continue
+                filled = new_data[i] is not None
+                if filled is not cur_filled:
+                    if filled:
+                        painter.setPen(_PEN_SEL)
+                        painter.setBrush(_COL_BLUE_BG)
+                    else:
+                        painter.setPen(_PEN_CELL)
+                        painter.setBrush(Qt.NoBrush)
+                    cur_filled = filled
                 painter.drawRect(x, new_y, cell_width, cell_height)
-                val = new_data[i] if i < len(new_data) else None
-                if val is None:
-                    painter.setPen(QPen(QColor(150, 150, 150)))
-                    painter.drawText(x + int(20 * scale), new_y + int(25 * scale), "")
-                else:
-                    painter.setPen(QPen(Qt.black))
+            painter.setPen(_PEN_CELL)
+            painter.setBrush(Qt.NoBrush)
+            for i in range(with_val, total_new):
+                x = start_x + i * cell_width
+                if not self._in_dirty(x, cell_width):
+                    continue
+                painter.drawRect(x, new_y, cell_width, cell_height)
+            painter.setPen(_PEN_TEXT)
+            for i in range(with_val):
+                x = start_x + i * cell_width
+                if not self._in_dirty(x, val_span):
+                    continue
+                val = new_data[i]
+                if val is not None:
                     painter.drawText(x + int(20 * scale), new_y + int(25 * scale), str(val))
 
             # 复制阶段：绘制从旧表到新表的箭头（索引一致）
@@ -1714,17 +1918,11 @@ class LinearCanvas(QWidget):
                     oy = start_y + cell_height // 2
                     nx = start_x + idx * cell_width + cell_width // 2
                     ny = new_y + cell_height // 2
-                    painter.setPen(QPen(QColor(66, 66, 66), 2))
+                    painter.setPen(_PEN_ARROW_BOLD)
                     painter.drawLine(ox, oy, nx, ny)
                     # 箭头
-                    angle = math.atan2(ny - oy, nx - ox)
-                    ah = int(10 * scale)
-                    ax1 = int(nx - ah * math.cos(angle - math.pi/6))
-                    ay1 = int(ny - ah * math.sin(angle - math.pi/6))
-                    ax2 = int(nx - ah * math.cos(angle + math.pi/6))
-                    ay2 = int(ny - ah * math.sin(angle + math.pi/6))
-                    painter.drawLine(ax1, ay1, nx, ny)
-                    painter.drawLine(ax2, ay2, nx, ny)
+                    ax1, ay1, ax2, ay2 = _arrowhead_points(ox, oy, nx, ny, int(10 * scale))
+                    self._draw_arrowhead(painter, nx, ny, ax1, ay1, ax2, ay2)
             return
 
         # ---- 默认：单表绘制 ----
@@ -1736,43 +1934,51 @@ class LinearCanvas(QWidget):
         
         # 计算应绘制的总槽位数（优先使用容量）
         total_cells = self.capacity if self.capacity is not None else len(self.data)
+        data = self.data
+        hl_brush = self._highlight_brush()
+        with_val = min(total_cells, len(data))
+        value_strs = self._value_strs()
+        index_strs = self._index_labels(total_cells)
+        
+        # 文本可能超出单元格：标签/值的剔除宽度取单元格与最宽文本右端的较大者
+        idx_span = max(cell_width, text_off + fm.horizontalAdvance(index_strs[total_cells - 1])) if total_cells else cell_width
+        val_span = max(cell_width, text_off + self._value_text_width(fm))
         
         # 绘制索引
         for i in range(total_cells):
             x = start_x + i * cell_width
-            painter.drawText(x + int(20 * scale), start_y - int(10 * scale), str(i))
-        
-        # 绘制单元格和值（为未赋值的槽位也绘制空格）
-        for i in range(total_cells):
+            if not self._in_dirty(x, idx_span):
+                continue
+            self._draw_static(painter, x + text_off, start_y - int(10 * scale), index_strs[i], asc)
+        
+        # 绘制单元格（支持动画高亮、选择、悬停；为未赋值的槽位也绘制空格）
+        # 默认样式单元格一次批量绘制，高亮/选中/悬停的少量单元格随后单独绘制
+        styles = self._cell_styles(hl_brush)
+        special = self._special_styles()
+        painter.setPen(_PEN_CELL)
+        painter.setBrush(Qt.NoBrush)
+        rects = [QRect(start_x + i * cell_width, start_y, cell_width, cell_height)
+                 for i in range(total_cells)
+                 if i not in special and self._in_dirty(start_x + i * cell_width, cell_width)]
+        if rects:
+            painter.drawRects(rects)
+        for i, style in special.items():
             x = start_x + i * cell_width
-            
-            # 绘制单元格（支持动画高亮、选择、悬停）
-            if self.highlighted_index is not None and i == self.highlighted_index:
-                try:
-                    alpha = max(0, min(255, int(60 + 195 * self.highlight_opacity)))
-                except Exception:
-                    alpha = 255
-                painter.setPen(QPen(QColor(255, 152, 0), 2))
-                painter.setBrush(QColor(255, 224, 178, alpha))
-            elif self.selected_index is not None and i == self.selected_index:
-                painter.setPen(QPen(QColor(0, 122, 204), 2))
-                painter.setBrush(QColor(190, 220, 255))
-            elif self.hovered_index is not None and i == self.hovered_index:
-                painter.setPen(QPen(QColor(30, 144, 255), 2))
-                painter.setBrush(QColor(230, 245, 255))
-            else:
-                painter.setPen(QPen(Qt.black, 2))
-                painter.setBrush(Qt.NoBrush)
+            if i < 0 or i >= total_cells or not self._in_dirty(x, cell_width):
+                continue
+            pen, brush = styles[style]
+            painter.setPen(pen)
+            painter.setBrush(brush)
             painter.drawRect(x, start_y, cell_width, cell_height)
-            
-            # 绘制值
-            value = self.data[i] if i < len(self.data) else None
-            if value is None:
-                painter.setPen(QPen(QColor(150, 150, 150)))
-                painter.drawText(x + int(20 * scale), start_y + int(25 * scale), "")
-            else:
-                painter.setPen(QPen(Qt.black))
-                painter.drawText(x + int(20 * scale), start_y + int(25 * scale), str(value))
+        
+        # 统一以黑色绘制值（超出数据长度的槽位为空，不绘制文本）
+        painter.setPen(_PEN_TEXT)
+        for i in range(with_val):
+            x = start_x + i * cell_width
+            if not self._in_dirty(x, val_span):
+                continue
+            if data[i] is not None:
+                self._draw_static(painter, x + text_off, start_y + int(25 * scale), value_strs[i], asc)
     
     def _draw_linked_list(self, painter):
         """绘制链表
@@ -1783,11 +1989,10 @@ class LinearCanvas(QWidget):
         # 设置字体
         font = self._scaled_font(12)
         painter.setFont(font)
+        fm = painter.fontMetrics()
+        asc = fm.ascent()
         # 根据字体缩放比例同步调整节点尺寸与间距
-        try:
-            scale = self._font_scale()
-        except Exception:
-            scale = 1.0
+        scale = self._scale_cached
         node_width = int(60 * scale)
         node_height = int(40 * scale)
         arrow_length = int(60 * scale)
@@ -1797,64 +2002,80 @@ class LinearCanvas(QWidget):
         # 绘制链表标题
         painter.drawText(start_x, start_y - int(30 * scale), "链表")
         
+        hl_brush = self._highlight_brush()
+        n = len(self.data)
+        value_strs = self._value_strs()
+        index_strs = self._index_labels(n)
+        # 文本可能超出节点：标签/值的剔除宽度取节点与最宽文本右端的较大者
+        text_off = int(20 * scale)
+        idx_span = max(node_width, text_off + fm.horizontalAdvance(index_strs[n - 1])) if n else node_width
+        val_span = max(node_width, text_off + self._value_text_width(fm))
+        
         # 绘制索引标签
-        for i in range(len(self.data)):
+        for i in range(n):
             x = start_x + i * (node_width + arrow_length)
-            painter.drawText(x + int(20 * scale), start_y - int(10 * scale), str(i))
-        
-        # 绘制节点和箭头
-        for i, value in enumerate(self.data):
+            if not self._in_dirty(x, idx_span):
+                continue
+            self._draw_static(painter, x + int(20 * scale), start_y - int(10 * scale), index_strs[i], asc)
+        
+        # 绘制节点（支持动画高亮、选择、悬停；值沿用节点边框颜色）
+        # 默认样式节点一次批量绘制，高亮/选中/悬停的少量节点随后单独绘制
+        styles = self._cell_styles(hl_brush)
+        special = self._special_styles()
+        default_xs = [start_x + i * (node_width + arrow_length) for i in range(n) if i not in special]
+        default_xs = [x for x in default_xs if self._in_dirty(x, node_width)]
+        painter.setPen(_PEN_CELL)
+        painter.setBrush(Qt.NoBrush)
+        if default_xs:
+            painter.drawRects([QRect(x, start_y, node_width, node_height) for x in default_xs])
+        for i in range(n):
+            if i in special:
+                continue
             x = start_x + i * (node_width + arrow_length)
-            
-            # 绘制节点（支持动画高亮、选择、悬停）
-            if self.highlighted_index is not None and i == self.highlighted_index:
-                try:
-                    alpha = max(0, min(255, int(60 + 195 * self.highlight_opacity)))
-                except Exception:
-                    alpha = 255
-                painter.setPen(QPen(QColor(255, 152, 0), 2))
-                painter.setBrush(QColor(255, 224, 178, alpha))
-            elif self.selected_index is not None and i == self.selected_index:
-                painter.setPen(QPen(QColor(0, 122, 204), 2))
-                painter.setBrush(QColor(190, 220, 255))
-            elif self.hovered_index is not None and i == self.hovered_index:
-                painter.setPen(QPen(QColor(30, 144, 255), 2))
-                painter.setBrush(QColor(230, 245, 255))
-            else:
-                painter.setPen(QPen(Qt.black, 2))
-                painter.setBrush(Qt.NoBrush)
+            if self._in_dirty(x, val_span):
+                self._draw_static(painter, x + int(20 * scale), start_y + int(25 * scale), value_strs[i], asc)
+        for i, style in special.items():
+            x = start_x + i * (node_width + arrow_length)
+            if i < 0 or i >= n or not self._in_dirty(x, val_span):
+                continue
+            pen, brush = styles[style]
+            painter.setPen(pen)
+            painter.setBrush(brush)
             painter.drawRect(x, start_y, node_width, node_height)
-            
-            # 绘制值
-            painter.drawText(x + int(20 * scale), start_y + int(25 * scale), str(value))
-            
-            # 绘制箭头（除了最后一个节点）
-            if i < len(self.data) - 1:
-                skip_arrow = False
-                # 插入阶段：在前驱指向插入节点步骤，移除前驱→后继的水平箭头
-                if self.step_type == 'insert_link_prev' and self.linked_aux and isinstance(self.linked_aux.get('index'), int):
-                    idx = self.linked_aux.get('index')
-                    prev_i = idx - 1 if idx > 0 else None
-                    if prev_i is not None and i == prev_i:
-                        skip_arrow = True
-                # 删除阶段：在重连及后续保留阶段，移除前驱→目标的水平箭头
-                if (not skip_arrow) and self.persist_delete_arrow and isinstance(self.persist_delete_index, int):
-                    prev_i_del = self.persist_delete_index - 1 if self.persist_delete_index > 0 else None
-                    if prev_i_del is not None and i == prev_i_del:
-                        skip_arrow = True
-                if not skip_arrow:
-                    arrow_x = x + node_width
-                    arrow_y = start_y + node_height // 2
-                    painter.setPen(QPen(QColor(66, 66, 66)))
-                    painter.drawLine(arrow_x, arrow_y, arrow_x + arrow_length, arrow_y)
-                    painter.drawLine(arrow_x + arrow_length - int(10 * scale), arrow_y - int(5 * scale), arrow_x + arrow_length, arrow_y)
-                    painter.drawLine(arrow_x + arrow_length - int(10 * scale), arrow_y + int(5 * scale), arrow_x + arrow_length, arrow_y)
-        
-        # 绘制最后一个节点的NULL指针
+            self._draw_static(painter, x + int(20 * scale), start_y + int(25 * scale), value_strs[i], asc)
+        
+        # 绘制节点间箭头（除了最后一个节点）
+        painter.setPen(_PEN_ARROW)
+        for i in range(n - 1):
+            x = start_x + i * (node_width + arrow_length)
+            if not self._in_dirty(x + node_width, arrow_length):
+                continue
+            skip_arrow = False
+            # 插入阶段：在前驱指向插入节点步骤，移除前驱→后继的水平箭头
+            if self.step_type == 'insert_link_prev' and self.linked_aux and isinstance(self.linked_aux.get('index'), int):
+                idx = self.linked_aux.get('index')
+                prev_i = idx - 1 if idx > 0 else None
+                if prev_i is not None and i == prev_i:
+                    skip_arrow = True
+            # 删除阶段：在重连及后续保留阶段，移除前驱→目标的水平箭头
+            if (not skip_arrow) and self.persist_delete_arrow and isinstance(self.persist_delete_index, int):
+                prev_i_del = self.persist_delete_index - 1 if self.persist_delete_index > 0 else None
+                if prev_i_del is not None and i == prev_i_del:
+                    skip_arrow = True
+            if not skip_arrow:
+                arrow_x = x + node_width
+                arrow_y = start_y + node_height // 2
+                painter.drawLine(arrow_x, arrow_y, arrow_x + arrow_length, arrow_y)
+                tail_x = arrow_x + arrow_length - int(10 * scale)
+                self._draw_arrowhead(painter, arrow_x + arrow_length, arrow_y,
+                                     tail_x, arrow_y - int(5 * scale), tail_x, arrow_y + int(5 * scale))
+    
+        # 绘制最后一个节点的NULL指针（沿用尾节点的边框颜色）
         if self.data:
+            painter.setPen(styles[special.get(n - 1, 0)][0])
             last_x = start_x + (len(self.data) - 1) * (node_width + arrow_length) + node_width
             last_y = start_y + node_height // 2
-            painter.drawText(last_x + int(10 * scale), last_y + int(5 * scale), "NULL")
+            self._draw_static(painter, last_x + int(10 * scale), last_y + int(5 * scale), "NULL", asc)
         
         # 插入动画的辅助节点绘制
         if self.linked_aux and self.step_type in ('insert_prepare','insert_link_next','insert_link_prev'):
@@ -1874,8 +2095,8 @@ class LinearCanvas(QWidget):
                 gap_center_x = start_x + node_width / 2
             x_aux = int(gap_center_x - node_width / 2)
             y_aux = start_y + node_height + int(60 * scale)
-            painter.setPen(QPen(QColor(255, 152, 0), 2))
-            painter.setBrush(QColor(255, 224, 178))
+            painter.setPen(_PEN_HL)
+            painter.setBrush(_COL_HL_BG)
             painter.drawRect(x_aux, y_aux, node_width, node_height)
             painter.drawText(x_aux + int(15 * scale), y_aux + int(25 * scale), str(aux_value))
         
@@ -1896,7 +2117,7 @@ class LinearCanvas(QWidget):
                 gap_center_x = start_x + node_width / 2
             x_aux = int(gap_center_x - node_width / 2)
             y_aux = start_y + node_height + int(60 * scale)
-            painter.setPen(QPen(QColor(66, 66, 66)))
+            painter.setPen(_PEN_ARROW)
             # 保留：插入节点指向后继
             if self.persist_next_arrow:
                 sx = x_aux + node_width // 2
@@ -1908,16 +2129,10 @@ class LinearCanvas(QWidget):
                     ex = sx + arrow_length
                     ey = sy - max(int(20 * scale), arrow_length // 2)
                 painter.drawLine(sx, sy, ex, ey)
-                angle = math.atan2(ey - sy, ex - sx)
-                ah = int(10 * scale)
-                ax1 = int(ex - ah * math.cos(angle - math.pi/6))
-                ay1 = int(ey - ah * math.sin(angle - math.pi/6))
-                ax2 = int(ex - ah * math.cos(angle + math.pi/6))
-                ay2 = int(ey - ah * math.sin(angle + math.pi/6))
-                painter.drawLine(ax1, ay1, ex, ey)
-                painter.drawLine(ax2, ay2, ex, ey)
+                ax1, ay1, ax2, ay2 = _arrowhead_points(sx, sy, ex, ey, int(10 * scale))
+                self._draw_arrowhead(painter, ex, ey, ax1, ay1, ax2, ay2)
                 if next_x is None:
-                    painter.drawText(ex + int(5 * scale), ey - int(5 * scale), "NULL")
+                    self._draw_static(painter, ex + int(5 * scale), ey - int(5 * scale), "NULL", asc)
             # 保留：前驱指向插入节点
             if self.persist_prev_arrow and prev_x is not None:
                 sx = prev_x + node_width // 2
@@ -1925,14 +2140,8 @@ class LinearCanvas(QWidget):
                 ex = x_aux + node_width // 2
                 ey = y_aux
                 painter.drawLine(sx, sy, ex, ey)
-                angle = math.atan2(ey - sy, ex - sx)
-                ah = int(10 * scale)
-                ax1 = int(ex - ah * math.cos(angle - math.pi/6))
-                ay1 = int(ey - ah * math.sin(angle - math.pi/6))
-                ax2 = int(ex - ah * math.cos(angle + math.pi/6))
-                ay2 = int(ey - ah * math.sin(angle + math.pi/6))
-                painter.drawLine(ax1, ay1, ex, ey)
-                painter.drawLine(ax2, ay2, ex, ey)
+                ax1, ay1, ax2, ay2 = _arrowhead_points(sx, sy, ex, ey, int(10 * scale))
+                self._draw_arrowhead(painter, ex, ey, ax1, ay1, ax2, ay2)
         
         # 持久删除箭头：前驱指向后继，跳过被删目标节点（向下弯圆弧，终点为后继底边中点）
         if self.persist_delete_arrow and isinstance(self.persist_delete_index, int):
@@ -1950,7 +2159,7 @@ class LinearCanvas(QWidget):
                 else:
                     ex = sx + arrow_length
                     ey = sy - max(int(20 * scale), arrow_length // 2)
-                painter.setPen(QPen(QColor(66, 66, 66), 2))
+                painter.setPen(_PEN_ARROW_BOLD)
                 path = QPainterPath()
                 path.moveTo(sx, sy)
                 mid_x = (sx + ex) / 2
@@ -1959,16 +2168,10 @@ class LinearCanvas(QWidget):
                 ctrl_y = max(sy, ey) + arc_depth
                 path.quadTo(ctrl_x, ctrl_y, ex, ey)
                 painter.drawPath(path)
-                angle = math.atan2(ey - ctrl_y, ex - ctrl_x)
-                ah = int(10 * scale)
-                ax1 = int(ex - ah * math.cos(angle - math.pi/6))
-                ay1 = int(ey - ah * math.sin(angle - math.pi/6))
-                ax2 = int(ex - ah * math.cos(angle + math.pi/6))
-                ay2 = int(ey - ah * math.sin(angle + math.pi/6))
-                painter.drawLine(ax1, ay1, ex, ey)
-                painter.drawLine(ax2, ay2, ex, ey)
+                ax1, ay1, ax2, ay2 = _arrowhead_points(ctrl_x, ctrl_y, ex, ey, int(10 * scale))
+                self._draw_arrowhead(painter, ex, ey, ax1, ay1, ax2, ay2)
                 if next_x is None:
-                    painter.drawText(ex + int(5 * scale), ey - int(5 * scale), "NULL")
+                    self._draw_static(painter, ex + int(5 * scale), ey - int(5 * scale), "NULL", asc)
     
     def _draw_stack(self, painter):
                 """绘制栈
@@ -1979,11 +2182,10 @@ class LinearCanvas(QWidget):
                 # 设置字体
                 font = self._scaled_font(12)
                 painter.setFont(font)
+                fm = painter.fontMetrics()
+                asc = fm.ascent()
                 # 根据字体缩放比例同步调整单元格尺寸与间距
-                try:
-                    scale = self._font_scale()
-                except Exception:
-                    scale = 1.0
+                scale = self._scale_cached
                 cell_width = int(100 * scale)
                 cell_height = int(40 * scale)
                 margin_bottom = int(60 * scale)
@@ -2004,27 +2206,41 @@ class LinearCanvas(QWidget):
                     painter.drawText(start_x - int(80 * scale), top_label_y, "栈顶")
                 
                 # 绘制栈元素（从下往上）
-                for i, value in enumerate(self.data):
+                value_strs = self._value_strs()
+                text_off = int(40 * scale)
+                # 栈只有一列：整列（含可能超出单元格的值文本）不在脏区域内时跳过全部单元格；
+                # 否则只处理与脏区域纵向相交的行
+                if not self._in_dirty(start_x, max(cell_width, text_off + self._value_text_width(fm))):
+                    return
+                rows = [i for i in range(len(self.data)) if self._in_dirty_y(start_y - i * cell_height, cell_height)]
+                # 绘制单元格（支持高亮栈顶或指定索引）：默认样式批量绘制，特殊样式单独绘制
+                styles = self._cell_styles(_COL_HL_BG)
+                special = self._special_styles()
+                painter.setPen(_PEN_CELL)
+                painter.setBrush(Qt.NoBrush)
+                rects = [QRect(start_x, start_y - i * cell_height, cell_width, cell_height)
+                         for i in rows if i not in special]
+                if rects:
+                    painter.drawRects(rects)
+                for i, style in special.items():
+                    if i < 0 or i >= len(self.data) or not self._in_dirty_y(start_y - i * cell_height, cell_height):
+                        continue
+                    pen, brush = styles[style]
+                    painter.setPen(pen)
+                    painter.setBrush(brush)
+                    painter.drawRect(start_x, start_y - i * cell_height, cell_width, cell_height)
+                
+                # 绘制值
+                painter.setPen(_PEN_TEXT)
+                for i in rows:
                     y = start_y - i * cell_height
-                    
-                    # 绘制单元格（支持高亮栈顶或指定索引）
-                    if self.highlighted_index is not None and i == self.highlighted_index:
-                        painter.setPen(QPen(QColor(255, 152, 0), 2))
-                        painter.setBrush(QColor(255, 224, 178))
-                    elif self.selected_index is not None and i == self.selected_index:
-                        painter.setPen(QPen(QColor(0, 122, 204), 2))
-                        painter.setBrush(QColor(190, 220, 255))
-                    elif self.hovered_index is not None and i == self.hovered_index:
-                        painter.setPen(QPen(QColor(30, 144, 255), 2))
-                        painter.setBrush(QColor(230, 245, 255))
-                    else:
-                        painter.setPen(QPen(Qt.black, 2))
-                        painter.setBrush(Qt.NoBrush)
-                    painter.drawRect(start_x, y, cell_width, cell_height)
-                    
-                    # 绘制值
-                    painter.setPen(QPen(Qt.black))
-                    painter.drawText(start_x + int(40 * scale), y + int(25 * scale), str(value))
+                    self._draw_static(painter, start_x + text_off, y + int(25 * scale), value_strs[i], asc)
+
+    @staticmethod
+    def _draw_arrowhead(painter, ex, ey, ax1, ay1, ax2, ay2):
+        """以单次折线绘制箭头头部（尾点1 → 尖端 → 尾点2）"""
+        painter.drawPolyline(QPolygonF([QPointF(ax1, ay1), QPointF(ex, ey), QPointF(ax2, ay2)]))
+
     @property
     def highlighted_index(self):
         return self._highlighted_index
@@ -2037,29 +2253,22 @@ class LinearCanvas(QWidget):
 
     def _start_highlight_fade(self):
         try:
-            if self._highlight_anim:
-                self._highlight_anim.stop()
+            self._highlight_anim.stop()
             if self._highlighted_index is None:
                 # 无高亮时直接透明
                 self.highlight_opacity = 0.0
                 self.update()
                 return
             self.highlight_opacity = 0.0
-            anim = QVariantAnimation(self)
-            anim.setDuration(400)
-            anim.setStartValue(0.0)
-            anim.setEndValue(1.0)
-            anim.setEasingCurve(QEasingCurve.OutCubic)
-            def on_value(v):
-                self.highlight_opacity = float(v)
-                self.update()
-            anim.valueChanged.connect(on_value)
-            self._highlight_anim = anim
-            anim.start()
+            self._highlight_anim.start()
         except Exception:
             self.highlight_opacity = 1.0
             self.update()
 
+    def _on_highlight_value(self, v):
+        self.highlight_opacity = float(v)
+        self.update()
+
     # ------- 交互：缩放与平移、悬停与点击 -------
     def _to_scene(self, pos):
         """将窗口坐标转换为场景坐标（考虑当前平移与缩放）"""
@@ -2153,10 +2362,7 @@ class LinearCanvas(QWidget):
         try:
             x, y = scene_pos
             if self.structure_type == "array_list":
-                try:
-                    scale = self._font_scale()
-                except Exception:
-                    scale = 1.0
+                scale = self._scale_cached
                 cell_width = int(60 * scale)
                 cell_height = int(40 * scale)
                 start_x = int(50 * scale)
@@ -2169,10 +2375,7 @@ class LinearCanvas(QWidget):
                         return i
                 return None
             elif self.structure_type == "linked_list":
-                try:
-                    scale = self._font_scale()
-                except Exception:
-                    scale = 1.0
+                scale = self._scale_cached
                 node_width = int(60 * scale)
                 node_height = int(40 * scale)
                 arrow_length = int(60 * scale)
@@ -2185,10 +2388,7 @@ class LinearCanvas(QWidget):
                         return i
                 return None
             elif self.structure_type == "stack":
-                try:
-                    scale = self._font_scale()
-                except Exception:
-                    scale = 1.0
+                scale = self._scale_cached
                 cell_width = int(100 * scale)
                 cell_height = int(40 * scale)
                 margin_bottom = int(60 * scale)
@@ -7,19 +7,171 @@
 
 from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QPushButton, QComboBox,
-                             QLineEdit, QTextEdit, QMessageBox, QSplitter,
-                             QAction, QToolBar, QStatusBar, QGroupBox, QDialog)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QIcon, QFont
+                             QLineEdit, QTextEdit, QPlainTextEdit, QMessageBox, QSplitter,
+                             QAction, QToolBar, QStatusBar, QGroupBox, QDialog,
+                             QApplication, QActionGroup)
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer
+from PyQt5.QtGui import QIcon, QFont, QColor, QSyntaxHighlighter, QTextCharFormat, QTextDocument
 
 from views.linear_view import LinearView
 from views.tree_view import TreeView
-from utils.theme import get_app_qss
+from utils.theme import get_app_qss, DEFAULT_BASE_FONT_PX
 from services.operation_recorder import OperationRecorder
+import bisect
+import functools
 import re
-import html as _html
 import os
 
+# 历史记录 DSL 高亮用正则（作用于每行纯文本）
+# 引号文本与数字合并为一个交替模式，单次扫描完成着色（引号内的数字保持引号颜色）
+_TOKEN_RE = re.compile(r'".*?"|\b\d+\b')
+_CTX_TAG_RE = re.compile(r"\[(\w+)\]")
+_VERB_RE = re.compile(r"\S+")
+# 上下文标签颜色（未知上下文如 global 使用默认色）
+_CTX_COLORS = {"linear": "#1E90FF", "tree": "#2ECC71"}
+_CTX_DEFAULT = "#F39C12"
+
+
+def _font_px_for_width(w):
+    """基础字体像素公式：以 1000px 宽度为基准 13px，按宽度放大 1.0～1.6 倍"""
+    return int(round(13 * max(1.0, min(1.6, w / 1000.0))))
+
+
+# 字号逐级 +1px 的精确宽度断点（由上式逐像素求得），bisect 查表结果与公式完全一致
+_FONT_PX_MIN = _font_px_for_width(1)
+_FONT_PX_BREAKS = tuple(w for w in range(1001, 1601) if _font_px_for_width(w) != _font_px_for_width(w - 1))
+# 历史对话框每次加载的最近记录条数（“查看更多…”按此步长追加）
+_HISTORY_PAGE = 1000
+# 历史对话框标题（按上下文；None 表示全部）
+_HISTORY_TITLES = {"linear": "线性历史", "tree": "树形历史", None: "全部历史"}
+# DSL 帮助对话框中各选项卡的显示顺序
+_HELP_PAGE_ORDER = (
+    "线性通用",
+    "顺序表/链表",
+    "栈",
+    "树形通用",
+    "二叉树",
+    "BST",
+    "AVL",
+    "哈夫曼",
+    "树命令前缀风格",
+)
+# 帮助文档二级标题前缀 -> (该节默认页, ((子标题前缀, 页名), ...))
+_HELP_SECTIONS = {
+    "线性结构（arraylist / linkedlist / stack）": (
+        "线性通用",
+        (("ArrayList / LinkedList", "顺序表/链表"), ("Stack（栈）", "栈")),
+    ),
+    "树形结构": (
+        "树形通用",
+        (("BinaryTree", "二叉树"), ("BST", "BST"), ("AVL", "AVL"), ("Huffman", "哈夫曼")),
+    ),
+    "带前缀的树命令": ("树命令前缀风格", ()),
+}
+# “关于”对话框文本
+_ABOUT_TEXT = """
+数据结构可视化模拟器
+
+版本：1.0.0
+
+本程序用于可视化展示线性结构和树形结构的构建与算法执行过程。
+
+支持的数据结构：
+- 线性结构：顺序表、链表、栈
+- 树形结构：二叉树、二叉搜索树、平衡二叉树(AVL树)、哈夫曼树
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dsl_help_pages(doc_path, mtime):
+    """解析 DSL 命令参考文档为分页字典（按路径与修改时间缓存，文档不变时不重复解析）"""
+    try:
+        # 二进制一次读入后整体解码，省去文本模式的逐块解码与换行转换
+        with open(doc_path, "rb") as f:
+            lines = f.read().decode("utf-8").splitlines()
+    except Exception:
+        return None
+    buckets = {name: [] for name in _HELP_PAGE_ORDER}
+    section = None
+    current = None
+    for line in lines:
+        if line.startswith("## "):
+            h2 = line[3:].strip()
+            section = next((v for k, v in _HELP_SECTIONS.items() if h2.startswith(k)), None)
+            current = section[0] if section else None
+            continue
+        if section is None:
+            continue
+        for prefix, page in section[1]:
+            if line.startswith(prefix):
+                current = page
+                break
+        else:
+            buckets[current].append(line)
+    pages = {name: "\n".join(buckets[name]).strip() for name in _HELP_PAGE_ORDER[:-1]}
+    prefix_tree = buckets["树命令前缀风格"]
+    if any(prefix_tree):
+        pages["树命令前缀风格"] = "\n".join(prefix_tree).strip()
+    return pages
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dsl_help_html(doc_path, mtime):
+    """将各帮助分页的 Markdown 一次性转换为 HTML 并缓存，之后打开帮助只需 setHtml"""
+    pages = _load_dsl_help_pages(doc_path, mtime)
+    if not pages:
+        return None
+    doc = QTextDocument()
+    html_pages = {}
+    for name, text in pages.items():
+        doc.setMarkdown(text)
+        html_pages[name] = doc.toHtml()
+    return html_pages
+
+
+class _HistoryHighlighter(QSyntaxHighlighter):
+    """历史记录语法高亮：时间戳、上下文标签、首个动词、引号文本与数字
+
+    高亮按文本块（每行一条记录）由 Qt 在排版时惰性调用，只处理实际需要显示的行。
+    """
+
+    def __init__(self, document):
+        super().__init__(document)
+        self._fmt_ts = self._make_format("#888")
+        self._fmt_verb = self._make_format("#8E44AD", bold=True)
+        self._fmt_num = self._make_format("#27AE60")
+        self._fmt_quote = self._make_format("#D35400")
+        self._fmt_ctx = {ctx: self._make_format(color) for ctx, color in _CTX_COLORS.items()}
+        self._fmt_ctx_default = self._make_format(_CTX_DEFAULT)
+
+    @staticmethod
+    def _make_format(color, bold=False):
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        if bold:
+            fmt.setFontWeight(QFont.DemiBold)
+        return fmt
+
+    def highlightBlock(self, text):
+        # 行格式："时间戳 [上下文] DSL"（上下文标签仅在合并视图中出现）
+        ts_end = text.find(" ")
+        if ts_end < 0:
+            self.setFormat(0, len(text), self._fmt_ts)
+            return
+        self.setFormat(0, ts_end, self._fmt_ts)
+        pos = ts_end + 1
+        m = _CTX_TAG_RE.match(text, pos)
+        if m:
+            self.setFormat(m.start(), m.end() - m.start(), self._fmt_ctx.get(m.group(1), self._fmt_ctx_default))
+            pos = m.end() + 1
+        m = _VERB_RE.match(text, pos)
+        if m:
+            self.setFormat(m.start(), m.end() - m.start(), self._fmt_verb)
+        for m in _TOKEN_RE.finditer(text, pos):
+            start = m.start()
+            fmt = self._fmt_quote if text[start] == '"' else self._fmt_num
+            self.setFormat(start, m.end() - start, fmt)
+
 
 class MainWindow(QMainWindow):
     """主窗口类，应用程序的主界面"""
@@ -37,13 +189,34 @@ class MainWindow(QMainWindow):
         # 设置窗口属性
         self.setWindowTitle("数据结构可视化模拟器")
         self.setMinimumSize(1000, 700)
-        # 应用统一主题样式
+        # 应用统一主题样式：样式表只在应用级设置一次（不含字号），
+        # 字体缩放改走 QApplication.setFont，避免每次缩放重新解析 QSS 并 polish 全部控件
+        # （已是同一份样式表时跳过，避免对全部控件重新 polish）
+        app = QApplication.instance()
+        qss = get_app_qss(None)
+        if app.styleSheet() != qss:
+            app.setStyleSheet(qss)
         # 当前基础字体像素（用于自适应缩放）
-        self._current_base_font_px = 13
-        try:
-            self.setStyleSheet(get_app_qss(self._current_base_font_px))
-        except Exception:
-            pass
+        self._current_base_font_px = DEFAULT_BASE_FONT_PX
+        self._apply_base_font_px(self._current_base_font_px)
+        # 最近一次处理的窗口宽度档位（即 _FONT_PX_BREAKS 中的区间下标，与字号一一对应）
+        self._last_width_bucket = -1
+        
+        # 帮助对话框（首次打开时创建并缓存）
+        self._help_dlg = None
+        self._help_pages = None
+
+        # 历史记录对话框（首次打开时创建并缓存）
+        self._history_dlg = None
+        self._history_view = None
+        self._history_highlighter = None
+        self._history_more_btn = None
+        self._history_context = None
+        self._history_limit = _HISTORY_PAGE
+        # 已生成的历史文本缓存：仅对当前记录代次有效，(上下文, 条数上限) -> (文本, 是否还有更多)
+        self._history_cache_gen = -1
+        self._history_text_cache = {}
+        self._history_shown_key = None
         
         # 创建子视图
         self.linear_view = LinearView()
@@ -55,11 +228,14 @@ class MainWindow(QMainWindow):
         # 连接信号和槽
         self._connect_signals()
 
+        # 尺寸变化时合并连续的 resize 事件，仅在停止拖拽后更新字体缩放
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(80)
+        self._resize_timer.timeout.connect(self._update_font_scale_by_window)
+
         # 初始化一次字体缩放（在窗口显示或尺寸变化后会再次更新）
-        try:
-            self._update_font_scale_by_window()
-        except Exception:
-            pass
+        self._update_font_scale_by_window()
     
     def _init_ui(self):
         """初始化UI"""
@@ -100,79 +276,91 @@ class MainWindow(QMainWindow):
     # 已删除工具栏创建，避免在界面顶部显示“新建/清空/帮助”一行
     
     def _create_menu(self):
-        """创建菜单栏"""
+        """创建菜单栏（先构造全部动作，再按菜单批量添加）"""
         # 主菜单
         menu_bar = self.menuBar()
         
-        # 文件菜单
-        file_menu = menu_bar.addMenu("文件")
-        
         # 新建操作
         new_action = QAction("新建", self)
-        file_menu.addAction(new_action)
         
         # 保存操作
         save_action = QAction("保存", self)
         save_action.setShortcut("Ctrl+S")
         save_action.setStatusTip("保存当前数据结构到文件")
         save_action.triggered.connect(self._save_structure)
-        file_menu.addAction(save_action)
         
         # 加载操作
         load_action = QAction("加载", self)
         load_action.setShortcut("Ctrl+O")
         load_action.setStatusTip("从文件加载数据结构")
         load_action.triggered.connect(self._load_structure)
-        file_menu.addAction(load_action)
-        
-        # 添加分隔符
-        file_menu.addSeparator()
         
         # 退出操作
         exit_action = QAction("退出", self)
         exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
         
-        # 移除“编辑”菜单（包含清空操作），不再显示编辑栏
+        # 文件菜单
+        file_menu = menu_bar.addMenu("文件")
+        file_menu.addActions([new_action, save_action, load_action])
+        file_menu.addSeparator()
+        file_menu.addActions([exit_action])
         
-        # 帮助菜单
-        help_menu = menu_bar.addMenu("帮助")
+        # 移除“编辑”菜单（包含清空操作），不再显示编辑栏
         
+        # 帮助、历史菜单的动作没有快捷键，推迟到菜单首次弹出时再填入菜单；
+        # 文件菜单含 Ctrl+S / Ctrl+O 快捷键，需在启动时就注册，保持立即构建
+        self._help_menu = menu_bar.addMenu("帮助")
+        self._help_menu.aboutToShow.connect(self._populate_help_menu)
+
+        # 历史菜单（同文件、帮助同层）
+        self._history_menu = menu_bar.addMenu("历史")
+        self._history_menu.aboutToShow.connect(self._populate_history_menu)
+
+        # 历史动作本身立即创建（其他代码会切换其启用状态），仅在菜单首次弹出时才加入菜单；
+        # 三个动作只差上下文参数：放入同一动作组，以 data() 区分，由一个槽统一处理
+        self._history_group = QActionGroup(self)
+        self._history_group.setExclusive(False)
+        self._history_group.triggered.connect(self._on_history_action)
+
+        # 查看线性历史
+        self.linear_history_action = QAction("查看线性历史", self._history_group)
+        self.linear_history_action.setStatusTip("查看线性结构的 DSL 操作历史")
+        self.linear_history_action.setData("linear")
+
+        # 查看树形历史
+        self.tree_history_action = QAction("查看树形历史", self._history_group)
+        self.tree_history_action.setStatusTip("查看树形结构的 DSL 操作历史")
+        self.tree_history_action.setData("tree")
+
+        # 查看全部历史（data 为空表示全部上下文）
+        self.all_history_action = QAction("查看全部历史", self._history_group)
+        self.all_history_action.setStatusTip("查看线性与树形的合并历史")
+
+    @pyqtSlot()
+    def _populate_help_menu(self):
+        """首次弹出时填充帮助菜单"""
+        self._help_menu.aboutToShow.disconnect(self._populate_help_menu)
+
         # 帮助操作
         help_action = QAction("帮助", self)
         help_action.triggered.connect(self._show_help)
-        help_menu.addAction(help_action)
         
         # 关于操作
         about_action = QAction("关于", self)
         about_action.triggered.connect(self._show_about)
-        help_menu.addAction(about_action)
 
-        # 历史菜单（同文件、帮助同层）
-        history_menu = menu_bar.addMenu("历史")
-
-        # 查看线性历史
-        linear_history_action = QAction("查看线性历史", self)
-        linear_history_action.setStatusTip("查看线性结构的 DSL 操作历史")
-        linear_history_action.triggered.connect(lambda: self._show_history_dialog("线性历史", "linear"))
-        history_menu.addAction(linear_history_action)
+        self._help_menu.addActions([help_action, about_action])
 
-        # 查看树形历史
-        tree_history_action = QAction("查看树形历史", self)
-        tree_history_action.setStatusTip("查看树形结构的 DSL 操作历史")
-        tree_history_action.triggered.connect(lambda: self._show_history_dialog("树形历史", "tree"))
-        history_menu.addAction(tree_history_action)
-
-        # 查看全部历史
-        all_history_action = QAction("查看全部历史", self)
-        all_history_action.setStatusTip("查看线性与树形的合并历史")
-        all_history_action.triggered.connect(lambda: self._show_history_dialog("全部历史", None))
-        history_menu.addAction(all_history_action)
+    @pyqtSlot()
+    def _populate_history_menu(self):
+        """首次弹出时填充历史菜单"""
+        self._history_menu.aboutToShow.disconnect(self._populate_history_menu)
+        self._history_menu.addActions(self._history_group.actions())
     
     def _connect_signals(self):
         """连接信号和槽"""
-        # 连接选项卡切换信号
-        self.tab_widget.currentChanged.connect(self._tab_changed)
+        # 连接选项卡切换信号（显式选择 int 重载，与 pyqtSlot(int) 签名一致）
+        self.tab_widget.currentChanged[int].connect(self._tab_changed)
         
         # 连接LinearView的操作信号到MainWindow的信号
         self.linear_view.operation_triggered.connect(self._handle_linear_view_operation)
@@ -180,6 +368,7 @@ class MainWindow(QMainWindow):
         # 连接TreeView的操作信号到MainWindow的信号
         self.tree_view.operation_triggered.connect(self._handle_tree_view_operation)
     
+    @pyqtSlot(str, dict)
     def _handle_linear_view_operation(self, operation, params):
         """处理LinearView的操作信号
         
@@ -190,6 +379,7 @@ class MainWindow(QMainWindow):
         # 发射线性操作信号
         self.linear_action_triggered.emit(operation, params)
     
+    @pyqtSlot(str, dict)
     def _handle_tree_view_operation(self, operation, params):
         """处理TreeView的操作信号
         
@@ -201,6 +391,7 @@ class MainWindow(QMainWindow):
         self.tree_action_triggered.emit(operation, params)
     
     
+    @pyqtSlot(int)
     def _tab_changed(self, index):
         """选项卡切换处理
         
@@ -211,118 +402,39 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage(f"当前选项卡: {tab_name}")
 
     def _build_dsl_help_pages(self):
+        """返回帮助分页：页名 -> 预渲染的 HTML（文档缺失时返回 None）"""
         base_dir = os.path.dirname(os.path.abspath(__file__))
         doc_path = os.path.join(base_dir, "..", "docs", "DSL_命令参考.md")
         try:
-            with open(doc_path, "r", encoding="utf-8") as f:
-                lines = [l.rstrip("\n") for l in f.readlines()]
-        except Exception:
+            mtime = os.path.getmtime(doc_path)
+        except OSError:
             return None
-        pages = {}
-        h2 = None
-        sub = None
-        lin_general = []
-        lin_ll = []
-        lin_stack = []
-        tree_general = []
-        binarytree = []
-        bst = []
-        avl = []
-        huffman = []
-        prefix_tree = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if line.startswith("## "):
-                h2 = line[3:].strip()
-                sub = None
-                i += 1
-                continue
-            if h2 == "线性结构（arraylist / linkedlist / stack）":
-                if line.startswith("ArrayList / LinkedList"):
-                    sub = "ll"
-                    i += 1
-                    continue
-                if line.startswith("Stack（栈）"):
-                    sub = "stack"
-                    i += 1
-                    continue
-                if sub is None:
-                    lin_general.append(line)
-                elif sub == "ll":
-                    lin_ll.append(line)
-                elif sub == "stack":
-                    lin_stack.append(line)
-                i += 1
-                continue
-            if h2 and h2.startswith("树形结构"):
-                if line.startswith("BinaryTree"):
-                    sub = "binarytree"
-                    i += 1
-                    continue
-                if line.startswith("BST"):
-                    sub = "bst"
-                    i += 1
-                    continue
-                if line.startswith("AVL"):
-                    sub = "avl"
-                    i += 1
-                    continue
-                if line.startswith("Huffman"):
-                    sub = "huffman"
-                    i += 1
-                    continue
-                if sub is None:
-                    tree_general.append(line)
-                elif sub == "binarytree":
-                    binarytree.append(line)
-                elif sub == "bst":
-                    bst.append(line)
-                elif sub == "avl":
-                    avl.append(line)
-                elif sub == "huffman":
-                    huffman.append(line)
-                i += 1
-                continue
-            if h2 and h2.startswith("带前缀的树命令"):
-                prefix_tree.append(line)
-                i += 1
-                continue
-            i += 1
-        pages["线性通用"] = "\n".join(lin_general).strip()
-        pages["顺序表/链表"] = "\n".join(lin_ll).strip()
-        pages["栈"] = "\n".join(lin_stack).strip()
-        pages["树形通用"] = "\n".join(tree_general).strip()
-        pages["二叉树"] = "\n".join(binarytree).strip()
-        pages["BST"] = "\n".join(bst).strip()
-        pages["AVL"] = "\n".join(avl).strip()
-        pages["哈夫曼"] = "\n".join(huffman).strip()
-        if any(prefix_tree):
-            pages["树命令前缀风格"] = "\n".join(prefix_tree).strip()
-        return pages
+        return _load_dsl_help_html(doc_path, mtime)
     
+    @pyqtSlot()
     def _show_help(self):
         pages = self._build_dsl_help_pages()
         if not pages:
             QMessageBox.information(self, "帮助", "未找到 DSL 命令参考文档")
             return
+        # 帮助内容是静态的：对话框只构建一次，文档变化（缓存返回新的分页对象）时才重建
+        if self._help_dlg is None or self._help_pages is not pages:
+            if self._help_dlg is not None:
+                self._help_dlg.deleteLater()
+            self._help_dlg = self._build_help_dialog(pages)
+            self._help_pages = pages
+        self._help_dlg.show()
+        self._help_dlg.raise_()
+        self._help_dlg.activateWindow()
+
+    def _build_help_dialog(self, pages):
+        """构建 DSL 帮助对话框（每个分页一个只读选项卡）"""
         dlg = QDialog(self)
         dlg.setWindowTitle("DSL 命令帮助")
         layout = QVBoxLayout(dlg)
         tabs = QTabWidget(dlg)
         layout.addWidget(tabs)
-        order = [
-            "线性通用",
-            "顺序表/链表",
-            "栈",
-            "树形通用",
-            "二叉树",
-            "BST",
-            "AVL",
-            "哈夫曼",
-            "树命令前缀风格",
-        ]
-        for name in order:
+        for name in _HELP_PAGE_ORDER:
             if name not in pages:
                 continue
             text = pages.get(name, "")
@@ -330,27 +442,21 @@ class MainWindow(QMainWindow):
             v = QVBoxLayout(w)
             te = QTextEdit(w)
             te.setReadOnly(True)
-            te.setMarkdown(text)
+            te.setHtml(text)
             v.addWidget(te)
             tabs.addTab(w, name)
         dlg.resize(900, 600)
-        dlg.exec_()
+        return dlg
     
+    @pyqtSlot()
     def _show_about(self):
         """显示关于信息"""
-        about_text = """
-        数据结构可视化模拟器
-        
-        版本：1.0.0
-        
-        本程序用于可视化展示线性结构和树形结构的构建与算法执行过程。
-        
-        支持的数据结构：
-        - 线性结构：顺序表、链表、栈
-        - 树形结构：二叉树、二叉搜索树、平衡二叉树(AVL树)、哈夫曼树
-        """
-        
-        QMessageBox.about(self, "关于", about_text)
+        QMessageBox.about(self, "关于", _ABOUT_TEXT)
+
+    @pyqtSlot(QAction)
+    def _on_history_action(self, action):
+        context = action.data()
+        self._show_history_dialog(_HISTORY_TITLES.get(context, "全部历史"), context)
 
     def _show_history_dialog(self, title, context):
         """显示历史记录对话框
@@ -359,78 +465,88 @@ class MainWindow(QMainWindow):
             title: 对话框标题
             context: 上下文（"linear"、"tree" 或 None 表示全部）
         """
+        # 历史对话框只构建一次，之后复用并仅替换内容；
+        # 以纯文本 + 语法高亮器显示，避免 HTML 解析并只高亮可见行
+        if self._history_dlg is None:
+            dlg = QDialog(self)
+            layout = QVBoxLayout(dlg)
+            view = QPlainTextEdit(dlg)
+            view.setReadOnly(True)
+            view.setCenterOnScroll(False)
+            view.setStyleSheet("QPlainTextEdit { font-size: 20px; }")
+            layout.addWidget(view)
+            more_btn = QPushButton("查看更多…", dlg)
+            more_btn.clicked.connect(self._show_more_history)
+            layout.addWidget(more_btn)
+            dlg.resize(800, 500)
+            self._history_dlg = dlg
+            self._history_view = view
+            self._history_more_btn = more_btn
+            self._history_highlighter = _HistoryHighlighter(view.document())
+        self._history_context = context
+        self._history_limit = _HISTORY_PAGE
+        self._history_dlg.setWindowTitle(title)
+        self._reload_history()
+        self._history_dlg.exec_()
+
+    @pyqtSlot()
+    def _show_more_history(self):
+        """按页追加加载更早的历史记录"""
+        self._history_limit += _HISTORY_PAGE
+        self._reload_history()
+
+    def _reload_history(self):
+        """按当前上下文与条数上限刷新历史对话框内容"""
+        context = self._history_context
+        limit = self._history_limit
+        # 记录代次未变时复用已生成的文本；若视图正显示同一内容则无需替换
+        gen = OperationRecorder.get_generation()
+        if gen != self._history_cache_gen:
+            self._history_cache_gen = gen
+            self._history_text_cache.clear()
+        key = (gen, context, limit)
+        if key == self._history_shown_key:
+            return
+        cached = self._history_text_cache.get((context, limit))
+        if cached is None:
+            cached = self._render_history_text(context, limit)
+            self._history_text_cache[(context, limit)] = cached
+        text, has_more = cached
+        self._history_shown_key = key
+
+        self._history_more_btn.setVisible(has_more)
+        # 整体替换视图自带文档的内容（一次性 setPlainText，不逐行修改）；
+        # 文档始终是同一个，挂在其上的高亮器随之保持有效
+        self._history_view.setPlainText(text)
+
+    @staticmethod
+    def _render_history_text(context, limit):
+        """生成历史对话框的纯文本内容，返回 (文本, 是否可能还有更早的记录)"""
         try:
-            entries = OperationRecorder.get_history_entries(context)
+            ts_list, ctx_list, dsl_list = OperationRecorder.get_history_columns(context, limit=limit)
         except Exception:
-            entries = []
+            ts_list, ctx_list, dsl_list = [], [], []
 
-        if not entries:
-            html_text = "<p style='color:#888'>暂无历史记录</p>"
+        if not dsl_list:
+            return "暂无历史记录", False
+        ts_strs = map(OperationRecorder._format_ts, ts_list)
+        if context is None:
+            text = "\n".join(
+                f"{ts} [{ctx}] {dsl}" if ctx else f"{ts} {dsl}"
+                for ts, ctx, dsl in zip(ts_strs, ctx_list, dsl_list)
+            )
         else:
-            # Colors
-            color_ts = "#888"
-            color_ctx_linear = "#1E90FF"
-            color_ctx_tree = "#2ECC71"
-            color_ctx_global = "#F39C12"
-            color_verb = "#8E44AD"
-            color_num = "#27AE60"
-            color_quote = "#D35400"
-
-            def ctx_color(ctx):
-                if ctx == "linear":
-                    return color_ctx_linear
-                if ctx == "tree":
-                    return color_ctx_tree
-                return color_ctx_global
-
-            def highlight_dsl(dsl: str) -> str:
-                # Escape HTML first
-                esc = _html.escape(dsl)
-                # Highlight quoted text
-                esc = re.sub(r"(&quot;.*?&quot;)", lambda m: f"<span style='color:{color_quote}'>{m.group(1)}</span>", esc)
-                # Highlight numbers
-                esc = re.sub(r"\b(\d+)\b", lambda m: f"<span style='color:{color_num}'>{m.group(1)}</span>", esc)
-                # Highlight first verb at start
-                verb = (dsl.strip().split()[0]).lower() if dsl.strip() else ""
-                if verb:
-                    esc = re.sub(rf"^({re.escape(verb)})\b", lambda m: f"<span style='color:{color_verb};font-weight:600'>{m.group(1)}</span>", esc)
-                return esc
-
-            lines = [
-                "<div style='font-family:Consolas,Menlo,Monaco,monospace;font-size:20px;line-height:1.6'>"
-            ]
-            for e in entries:
-                ts = OperationRecorder._format_ts(e.get("ts"))
-                ctx = e.get("ctx")
-                dsl = e.get("dsl") or ""
-                ctx_tag = ""
-                if context is None and ctx:
-                    ctx_tag = f" <span style='color:{ctx_color(ctx)}'>[{ctx}]</span>"
-                line = (
-                    f"<span style='color:{color_ts}'>{_html.escape(ts)}</span>"
-                    f"{ctx_tag} "
-                    f"{highlight_dsl(dsl)}"
-                )
-                lines.append(f"<div>{line}</div>")
-            lines.append("</div>")
-            html_text = "".join(lines)
-
-        dlg = QDialog(self)
-        dlg.setWindowTitle(title)
-        layout = QVBoxLayout(dlg)
-        view = QTextEdit(dlg)
-        view.setReadOnly(True)
-        view.setAcceptRichText(True)
-        view.setHtml(html_text)
-        layout.addWidget(view)
-        dlg.resize(800, 500)
-        dlg.exec_()
+            text = "\n".join(f"{ts} {dsl}" for ts, dsl in zip(ts_strs, dsl_list))
+        # 返回条数达到上限时可能还有更早的记录
+        return text, len(dsl_list) >= limit
     
+    @pyqtSlot()
     def _save_structure(self):
         """保存当前数据结构"""
         # 发送信号通知控制器保存当前数据结构
         self.save_structure_requested.emit()
         
+    @pyqtSlot()
     def _load_structure(self):
         """加载数据结构"""
         # 发送信号通知控制器加载数据结构
@@ -447,29 +563,33 @@ class MainWindow(QMainWindow):
     # ------- 自适应字体缩放 -------
     def _compute_base_font_px(self):
         """根据窗口宽度计算基础字体像素大小"""
-        try:
-            w = max(1, int(self.width()))
-        except Exception:
-            w = 1000
-        # 以 1000px 宽度为基准 13px，最大不超过约 20px
-        scale = w / 1000.0
-        target = int(round(13 * max(1.0, min(1.6, scale))))
-        return target
+        # 以 1000px 宽度为基准 13px，最大约 21px；按精确断点查表
+        return _FONT_PX_MIN + bisect.bisect_right(_FONT_PX_BREAKS, self.width())
 
+    @pyqtSlot()
     def _update_font_scale_by_window(self):
         """当窗口尺寸变化时更新全局样式中的字体大小"""
+        if not hasattr(self, "_current_base_font_px"):
+            return
         px = self._compute_base_font_px()
-        if px != self._current_base_font_px:
-            self._current_base_font_px = px
-            try:
-                self.setStyleSheet(get_app_qss(px))
-            except Exception:
-                pass
+        if px == self._current_base_font_px:
+            return
+        self._current_base_font_px = px
+        self._apply_base_font_px(px)
+
+    @staticmethod
+    def _apply_base_font_px(px):
+        """以像素大小设置应用级默认字体（经字体变更事件传播到所有控件）"""
+        font = QApplication.font()
+        font.setPixelSize(px)
+        QApplication.setFont(font)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # 依据窗口大小调整全局字体大小
-        try:
-            self._update_font_scale_by_window()
-        except Exception:
-            pass
\ No newline at end of file
+        # 宽度未跨越字体分档时字号不会变化，直接返回
+        bucket = bisect.bisect_right(_FONT_PX_BREAKS, self.width())
+        if bucket == self._last_width_bucket:
+            return
+        self._last_width_bucket = bucket
+        # 依据窗口大小调整全局字体大小（防抖：重启定时器）
+        self._resize_timer.start()
\ No newline at end of file
@@ -5,6 +5,8 @@
 树形结构视图 - 用于展示和操作树形数据结构
 """
 
+from collections import defaultdict
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QComboBox, QLineEdit, QGroupBox, QFormLayout,
                              QMessageBox, QSplitter, QFrame, QRadioButton, QButtonGroup,
@@ -12,6 +14,101 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QVariantAnimation, QEasingCurve, QEvent
 from PyQt5.QtGui import QFont, QPainter, QPen, QColor, QBrush, QFontMetrics
 
+# 删除 '0'/'1' 的转换表：translate 后仍有剩余字符即说明不是合法二进制编码
+_BIN_STRIP = str.maketrans("", "", "01")
+
+# 操作类型中文名
+_OPERATION_CN = {"insert": "插入", "delete": "删除"}
+
+
+class HuffmanSteps:
+    """哈夫曼编码/解码的播放步骤（按列存储）
+
+    每列一个列表，按下标取用时才组装成步骤字典（键与原先逐步记录的字典一致）：
+    编码步骤含 mode/char/bit/step_in_char/total_char_steps，
+    解码步骤含 mode/bit/accum_code/recognized_char。
+    """
+
+    __slots__ = ('mode', 'bits', 'chars', 'step_in_char', 'total_char_steps',
+                 'accum_codes', 'recognized')
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.bits = []
+        # 编码列
+        self.chars = []
+        self.step_in_char = []
+        self.total_char_steps = []
+        # 解码列
+        self.accum_codes = []
+        self.recognized = []
+
+    def __len__(self):
+        return len(self.bits)
+
+    def __getitem__(self, i):
+        if self.mode == 'encode':
+            return {
+                'mode': 'encode',
+                'char': self.chars[i],
+                'bit': self.bits[i],
+                'step_in_char': self.step_in_char[i],
+                'total_char_steps': self.total_char_steps[i]
+            }
+        return {
+            'mode': 'decode',
+            'bit': self.bits[i],
+            'accum_code': self.accum_codes[i],
+            'recognized_char': self.recognized[i]
+        }
+
+    def status_texts(self):
+        """一次性生成每一步的状态文案（播放时按下标直接取用）"""
+        if self.mode == 'encode':
+            return [
+                f"哈夫曼编码：字符 '{ch}' 步骤 {k}/{total}（位 {bit}）"
+                for ch, k, total, bit in zip(self.chars, self.step_in_char, self.total_char_steps, self.bits)
+            ]
+        return [
+            f"哈夫曼解码：位 {bit}，累积 {accum} -> 识别 '{rc}'" if rc else f"哈夫曼解码：位 {bit}，累积 {accum}"
+            for bit, accum, rc in zip(self.bits, self.accum_codes, self.recognized)
+        ]
+
+
+def _walk_huffman_bits(left_of, right_of, root_id, binary, max_steps):
+    """沿哈夫曼树逐位行走，返回 (节点ID序列, HuffmanSteps)
+
+    left_of / right_of: 父节点ID -> (子节点ID, 字符)，字符非 None 表示叶子。
+    """
+    node_seq = []
+    steps = HuffmanSteps('decode')
+    # 逐位循环内使用局部绑定的 append，省去每次的属性查找
+    node_seq_append = node_seq.append
+    bits_append = steps.bits.append
+    accum_append = steps.accum_codes.append
+    recognized_append = steps.recognized.append
+    cur_id = root_id
+    # 当前码字在 binary 中的起始下标：累积编码直接切片得到，不做逐位字符串拼接
+    code_start = 0
+    for i, bit in enumerate(binary):
+        if i >= max_steps:
+            break
+        next_node = (left_of if bit == '0' else right_of).get(cur_id)
+        if next_node is None:
+            break
+        next_id, recognized = next_node
+        node_seq_append(next_id)
+        bits_append(bit)
+        accum_append(binary[code_start:i + 1])
+        recognized_append(recognized)
+        if recognized is not None:
+            # 识别到字符，重置回根节点
+            cur_id = root_id
+            code_start = i + 1
+        else:
+            cur_id = next_id
+    return node_seq, steps
+
 
 class TreeView(QWidget):
     """树形结构视图类，用于展示和操作树形数据结构"""
@@ -20,6 +117,21 @@ class TreeView(QWidget):
     operation_triggered = pyqtSignal(str, dict)  # 操作触发信号
     dsl_command_triggered = pyqtSignal(str)  # DSL命令触发信号
     
+    # 状态文案查找表（类级常量，避免每一步重复构造字典）
+    _TRAVERSAL_CN = {
+        "preorder": "前序遍历",
+        "inorder": "中序遍历",
+        "postorder": "后序遍历",
+        "levelorder": "层序遍历"
+    }
+    _BST_ACTION_CN = {"bst_insert": "BST插入路径步骤", "bst_delete": "BST删除路径步骤"}
+    # 路径动画结束后“仅执行”插入/删除的参数模板（控制器据此跳过再次播放路径）
+    _EXEC_ONLY_BASE = {'execute_only': True}
+    # 构建/删除动画定时器属性名（新增动画类型时在此登记，_cancel_all_animations 统一停止）
+    _ANIM_TIMER_ATTRS = ('bst_animation_timer', 'avl_animation_timer', 'huffman_animation_timer')
+    # 遍历方式单选按钮ID（1..4）-> 遍历类型
+    _TRAVERSAL_BY_ID = (None, "preorder", "inorder", "postorder", "levelorder")
+    
     def update_view(self, structure):
         """更新视图显示
         
@@ -37,12 +149,19 @@ class TreeView(QWidget):
             self.update_visualization({'type': None, 'nodes': []}, None)
             return
         
-        # 获取结构的可视化数据并更新显示
-        try:
-            vis_data = structure.get_visualization_data()
-        except Exception as e:
-            self.show_message("错误", f"获取可视化数据失败: {e}")
-            return
+        # 获取结构的可视化数据并更新显示；
+        # 结构提供 version 且未变化时复用上次的数据（缓存持有结构引用，避免 id 复用误判）
+        version = getattr(structure, 'version', None)
+        cached = self._vis_cache
+        if version is not None and cached is not None and cached[0] is structure and cached[1] == version:
+            vis_data = cached[2]
+        else:
+            try:
+                vis_data = structure.get_visualization_data()
+            except Exception as e:
+                self.show_message("错误", f"获取可视化数据失败: {e}")
+                return
+            self._vis_cache = (structure, version, vis_data) if version is not None else None
         
         self.update_visualization(vis_data, vis_data.get('type'))
     
@@ -71,89 +190,9 @@ class TreeView(QWidget):
                 pass
             return
         try:
-            # 构建ID映射与叶子映射
-            id_map = {}
-            char_leaf_id = {}
-            for node in data:
-                nid = node.get('id')
-                if nid is None:
-                    continue
-                id_map[nid] = node
-                ch = node.get('char')
-                if ch is not None:
-                    char_leaf_id[ch] = nid
-            
-            node_seq = []
-            step_info = []
-            for ch in text:
-                code = codes.get(ch)
-                if not code:
-                    continue
-                leaf_id = char_leaf_id.get(ch)
-                if not leaf_id:
-                    continue
-                # 叶->根，随后反转得到根->叶路径
-                path_rev_ids = [leaf_id]
-                cur_id = leaf_id
-                while True:
-                    cur_node = id_map.get(cur_id)
-                    if cur_node is None:
-                        break
-                    parent_id = cur_node.get('parent_id')
-                    if parent_id is None:
-                        parent_id = cur_node.get('parent')
-                    if parent_id is None:
-                        break
-                    path_rev_ids.append(parent_id)
-                    cur_id = parent_id
-                path_ids = list(reversed(path_rev_ids))
-                # 编码步骤与位数一一对应（跳过根）
-                for j in range(1, min(len(path_ids), len(code) + 1)):
-                    node_seq.append(path_ids[j])
-                    bit = code[j - 1]
-                    step_info.append({
-                        'mode': 'encode',
-                        'char': ch,
-                        'bit': bit,
-                        'step_in_char': j,
-                        'total_char_steps': len(code)
-                    })
-            
-            # 设置遍历播放数据
-            self.canvas.stop_animation()
-            self.canvas.traversal_order = [info['char'] for info in step_info]  # 仅用于长度与占位
-            self.canvas.traversal_type = "huffman_encode"
-            self.canvas.node_id_map = node_seq.copy()
-            self.canvas.current_traversal_index = -1
-            self.canvas.highlighted_nodes = []
-            self.huffman_step_info = step_info
-            
-            # 播放控制
-            self.prev_step_button.setEnabled(True)
-            self.next_step_button.setEnabled(True)
-            if hasattr(self, 'play_button'):
-                self.play_button.setEnabled(True)
-                self.replay_button.setEnabled(True)
-                self.play_button.setText("播放")
-            
-            # 若有步骤，显示第一步并开始播放
-            if self.canvas.node_id_map:
-                self.canvas.highlighted_nodes = [self.canvas.node_id_map[0]]
-                self.canvas.current_traversal_index = 0
-                # 配置时间轴滑块范围与当前位置
-                self._configure_timeline_slider()
-                info0 = self.huffman_step_info[0] if self.huffman_step_info else None
-                if info0:
-                    self.status_label.setText(
-                        f"哈夫曼编码：字符 '{info0['char']}' 步骤 {info0['step_in_char']}/{info0['total_char_steps']}（位 {info0['bit']}）"
-                    )
-                else:
-                    self.status_label.setText(f"哈夫曼编码路径步骤: 1/{len(self.canvas.node_id_map)}")
-                self.canvas.update()
-                QApplication.processEvents()
-                self._start_traversal_playback()
-        except Exception:
-            # 兜底：保留原始弹窗显示
+            node_seq, step_info = self._prepare_encode_steps(text, codes)
+        except (AttributeError, KeyError, TypeError):
+            # 兜底：树数据或编码表格式异常时，保留原始弹窗显示
             code_info = "哈夫曼编码表:\n"
             for char, code in codes.items():
                 code_info += f"{char}: {code}\n"
@@ -164,14 +203,43 @@ class TreeView(QWidget):
                 else:
                     encoding_process += f"{char} -> (未在编码表中)\n"
             self.show_message("哈夫曼编码详情", code_info + "\n" + encoding_process)
+            return
+        self._apply_huffman_playback("huffman_encode", node_seq, step_info)
+
+    def _prepare_encode_steps(self, text, codes):
+        """计算编码播放数据（不涉及界面），返回 (节点ID序列, HuffmanSteps)"""
+        # 每个字符的根->叶路径只计算一次（画布按数据版本缓存），逐字符直接查表
+        char_paths = self.canvas.huffman_char_paths()
+        
+        # 预先求出既有编码又有叶子路径的字符集合，循环体只处理有效字符
+        valid = {ch for ch in codes.keys() & char_paths.keys() if codes[ch] and char_paths[ch]}
+        
+        node_seq = []
+        step_info = HuffmanSteps('encode')
+        for ch in (c for c in text if c in valid):
+            code = codes[ch]
+            path_ids = char_paths[ch]
+            # 编码步骤与位数一一对应（跳过根），按列整段追加
+            n = min(len(path_ids), len(code) + 1)
+            k = n - 1
+            node_seq.extend(path_ids[1:n])
+            step_info.bits.extend(code[:k])
+            step_info.chars.extend([ch] * k)
+            step_info.step_in_char.extend(range(1, n))
+            step_info.total_char_steps.extend([len(code)] * k)
+        return node_seq, step_info
     
-    def highlight_huffman_decode_path(self, binary, decoded):
+    def highlight_huffman_decode_path(self, binary, decoded, max_steps=5000):
         """以遍历播放的方式高亮哈夫曼解码路径
         
         Args:
             binary: 二进制编码串
             decoded: 解码后的文本（用于结果展示，可选）
+            max_steps: 最多演示的位数，超出部分不生成播放步骤（避免超长输入占满内存与绘制）
         """
+        # 超出演示上限时的提示附在解码完成文案后，不覆盖各步骤的状态文案
+        omitted = len(binary) - max_steps
+        self.huffman_truncation_note = f"（仅演示前 {max_steps} 位，其余 {omitted} 位省略）" if omitted > 0 else ""
         data = getattr(self.canvas, 'data', None)
         if not data:
             try:
@@ -180,122 +248,120 @@ class TreeView(QWidget):
                 pass
             return
         try:
-            id_map = {node.get('id'): node for node in data if node.get('id') is not None}
-            # 构建父->子映射
-            children_map = {}
-            for node in data:
-                parent_id = node.get('parent_id')
-                if parent_id is None:
-                    parent_id = node.get('parent')
-                if parent_id is not None:
-                    children_map.setdefault(parent_id, []).append(node)
-            # 根节点
-            root_node = None
-            for node in data:
-                parent_id = node.get('parent_id')
-                if parent_id is None:
-                    parent_id = node.get('parent')
-                if parent_id is None:
-                    root_node = node
-                    break
-            if root_node is None:
-                self.show_message("错误", "未找到哈夫曼树根节点")
-                return
-            
-            def ordered_children(pid):
-                children = children_map.get(pid, [])
-                if not children:
-                    return []
-                return sorted(children, key=lambda c: c.get('x_pos', 0.5))  # 按x_pos判断左右
-            
-            node_seq = []
-            step_info = []
-            cur = root_node
-            accum = ""
-            for bit in binary:
-                oc = ordered_children(cur.get('id'))
-                next_node = None
-                if oc:
-                    if bit == '0':
-                        next_node = oc[0]
-                    elif len(oc) > 1:
-                        next_node = oc[1]
-                    else:
-                        next_node = oc[0]
-                if next_node is None:
-                    break
-                node_seq.append(next_node.get('id'))
-                accum += bit
-                recognized = next_node.get('char')
-                step_info.append({
-                    'mode': 'decode',
-                    'bit': bit,
-                    'accum_code': accum,
-                    'recognized_char': recognized
-                })
-                if recognized is not None:
-                    # 识别到字符，重置回根节点
-                    cur = root_node
-                    accum = ""
-                else:
-                    cur = next_node
-            
-            # 设置遍历播放数据
-            self.canvas.stop_animation()
-            self.canvas.traversal_order = [info.get('recognized_char') or '' for info in step_info]
-            self.canvas.traversal_type = "huffman_decode"
-            self.canvas.node_id_map = node_seq.copy()
-            self.canvas.current_traversal_index = -1
-            self.canvas.highlighted_nodes = []
-            self.huffman_step_info = step_info
-            self.huffman_decoded_text = decoded
-            
-            # 播放控制
-            self.prev_step_button.setEnabled(True)
-            self.next_step_button.setEnabled(True)
-            if hasattr(self, 'play_button'):
-                self.play_button.setEnabled(True)
-                self.replay_button.setEnabled(True)
-                self.play_button.setText("播放")
-            
-            # 若有步骤，显示第一步并开始播放
-            if self.canvas.node_id_map:
-                self.canvas.highlighted_nodes = [self.canvas.node_id_map[0]]
-                self.canvas.current_traversal_index = 0
-                # 配置时间轴滑块范围与当前位置
-                self._configure_timeline_slider()
-                info0 = self.huffman_step_info[0] if self.huffman_step_info else None
-                if info0:
-                    if info0.get('recognized_char'):
-                        self.status_label.setText(
-                            f"哈夫曼解码：位 {info0['bit']}，累积 {info0['accum_code']} -> 识别 '{info0['recognized_char']}'"
-                        )
-                    else:
-                        self.status_label.setText(
-                            f"哈夫曼解码：位 {info0['bit']}，累积 {info0['accum_code']}"
-                        )
-                else:
-                    self.status_label.setText(f"哈夫曼解码路径步骤: 1/{len(self.canvas.node_id_map)}")
-                self.canvas.update()
-                QApplication.processEvents()
-                self._start_traversal_playback()
-        except Exception:
-            # 兜底：保留原始解码过程弹窗
+            prepared = self._prepare_decode_steps(data, binary, max_steps)
+        except (AttributeError, KeyError, TypeError):
+            # 兜底：树数据格式异常时，保留原始解码过程弹窗
             decode_info = "解码过程:\n"
+            # 反向编码表：编码 -> 字符，每个累积前缀只需一次字典查找
+            code_to_char = {}
+            for char, code in self.get_current_huffman_codes().items():
+                code_to_char.setdefault(code, char)
             current_code = ""
-            for bit in binary:
+            for bit in binary[:max_steps]:
                 current_code += bit
-                found = False
-                for char, code in self.get_current_huffman_codes().items():
-                    if code == current_code:
-                        decode_info += f"{current_code} -> {char}\n"
-                        current_code = ""
-                        found = True
-                        break
-                if not found and len(current_code) > 0:
+                char = code_to_char.get(current_code)
+                if char is not None:
+                    decode_info += f"{current_code} -> {char}\n"
+                    current_code = ""
+                else:
                     decode_info += f"当前累积: {current_code}\n"
+            if omitted > 0:
+                decode_info += f"……其余 {omitted} 位省略\n"
             self.show_message("哈夫曼解码详情", decode_info)
+            return
+        if prepared is None:
+            self.show_message("错误", "未找到哈夫曼树根节点")
+            return
+        node_seq, step_info = prepared
+        self.huffman_decoded_text = decoded
+        self._apply_huffman_playback("huffman_decode", node_seq, step_info)
+
+    @staticmethod
+    def _prepare_decode_steps(data, binary, max_steps):
+        """计算解码播放数据（不涉及界面），返回 (节点ID序列, HuffmanSteps)；找不到根节点时返回 None"""
+        # 单次遍历同时构建父->子映射并找到根节点（parent_id 已在 update_data 中规范化）
+        children_map = defaultdict(list)
+        root_node = None
+        for node in data:
+            parent_id = node['parent_id']
+            if parent_id is not None:
+                children_map[parent_id].append(node)
+            elif root_node is None:
+                root_node = node
+        if root_node is None:
+            return None
+        # 子节点列表在解码过程中不变：每个父节点只按 x_pos 排序一次（判断左右），
+        # 拆成左/右两张表，值为 (id, char) 元组（只有一个孩子时左右都指向它）
+        left_of = {}
+        right_of = {}
+        for pid, children in children_map.items():
+            children.sort(key=lambda c: c.get('x_pos', 0.5))
+            left_of[pid] = (children[0].get('id'), children[0].get('char'))
+            right_of[pid] = (children[-1].get('id'), children[-1].get('char'))
+        
+        return _walk_huffman_bits(left_of, right_of, root_node.get('id'), binary, max_steps)
+
+    def _apply_huffman_playback(self, traversal_type, node_seq, step_info):
+        """将哈夫曼编码/解码步骤装入画布并从第一步开始播放"""
+        # 设置遍历播放数据（stop_animation 已清空高亮；高亮赋值会自行安排重绘，无需额外 update）
+        self._cancel_all_animations()
+        if step_info.mode == 'encode':
+            self.canvas.traversal_order = step_info.chars  # 仅用于长度与占位
+        else:
+            self.canvas.traversal_order = [rc or '' for rc in step_info.recognized]
+        self.canvas.traversal_type = traversal_type
+        self.canvas.node_id_map = node_seq  # 局部列表直接移交画布，无需复制
+        self.canvas.current_traversal_index = -1
+        self.huffman_step_info = step_info
+        # 每步状态文案在装载时一次生成，播放/拖动时只做下标访问
+        self.huffman_status_strings = step_info.status_texts()
+        
+        # 播放控制
+        self._set_playback_controls(True)
+        
+        # 若有步骤，显示第一步并开始播放
+        if not node_seq:
+            return
+        self.canvas.highlighted_nodes = [node_seq[0]]
+        self.canvas.current_traversal_index = 0
+        # 配置时间轴滑块范围与当前位置
+        self._configure_timeline_slider()
+        if self.huffman_status_strings:
+            self.status_label.setText(self.huffman_status_strings[0])
+        else:
+            self.status_label.setText(f"哈夫曼路径步骤: 1/{len(node_seq)}")
+        self._start_traversal_playback()
     
+    def _cancel_all_animations(self):
+        """停止所有构建/删除动画定时器、遍历播放定时器及画布遍历动画（保留已记录的步骤数据，便于重播）"""
+        for attr in self._ANIM_TIMER_ATTRS:
+            timer = getattr(self, attr, None)
+            if timer is not None and timer.isActive():
+                timer.stop()
+        # 旧的遍历播放须立即停下：否则在新路径延迟启动播放前，残留的 tick 可能抢先推进新路径的步骤
+        if self.traversal_play_timer.isActive():
+            self.traversal_play_timer.stop()
+        self.traversal_is_playing = False
+        self.canvas.stop_animation()
+
+    @staticmethod
+    def _set_button(btn, enabled=None, text=None):
+        """仅在状态确有变化时调用 setEnabled / setText，避免多余的信号与样式刷新"""
+        if enabled is not None and btn.isEnabled() != enabled:
+            btn.setEnabled(enabled)
+        if text is not None and btn.text() != text:
+            btn.setText(text)
+
+    def _set_playback_controls(self, enabled):
+        """统一设置上一步/下一步/播放/重播按钮的可用状态，并将播放按钮文案重置为“播放”"""
+        for name in ('prev_step_button', 'next_step_button', 'replay_button'):
+            btn = getattr(self, name, None)
+            if btn is not None:
+                self._set_button(btn, enabled)
+        play_button = getattr(self, 'play_button', None)
+        if play_button is not None:
+            self._set_button(play_button, enabled, "播放")
+
     def get_current_huffman_codes(self):
         """获取当前哈夫曼树的编码表
         
@@ -312,6 +378,8 @@ class TreeView(QWidget):
         
         # 当前选择的数据结构类型
         self.current_structure = "binary_tree"  # 默认为二叉树
+        # 上次获取的可视化数据：(结构, 版本, 数据)
+        self._vis_cache = None
         
         # 初始化哈夫曼动画相关属性
         self.huffman_animation_timer = QTimer()
@@ -322,6 +390,8 @@ class TreeView(QWidget):
         self.animation_speed = 1000  # 默认动画速度：1秒一步
         self.huffman_build_steps = []
         self.current_build_step = 0
+        # 哈夫曼编码/解码播放的逐步状态文案（见 _apply_huffman_playback）
+        self.huffman_status_strings = []
         
         # 初始化AVL动画相关属性
         self.avl_animation_timer = QTimer()
@@ -339,6 +409,7 @@ class TreeView(QWidget):
         except Exception:
             pass
         self.bst_build_steps = []
+        self._bst_step_statuses = []  # 与 bst_build_steps 一一对应的状态文案
         self.current_bst_step = 0
         self.bst_delete_steps = []
         self.current_bst_delete_step = 0
@@ -904,15 +975,7 @@ class TreeView(QWidget):
             self.last_operation_value = None
             
             # 禁用控制按钮并重置播放按钮文案
-            if hasattr(self, 'prev_step_button'):
-                self.prev_step_button.setEnabled(False)
-            if hasattr(self, 'next_step_button'):
-                self.next_step_button.setEnabled(False)
-            if hasattr(self, 'play_button'):
-                self.play_button.setEnabled(False)
-                self.play_button.setText("播放")
-            if hasattr(self, 'replay_button'):
-                self.replay_button.setEnabled(False)
+            self._set_playback_controls(False)
             # 重置时间轴滑块
             if hasattr(self, 'timeline_slider'):
                 try:
@@ -1034,11 +1097,8 @@ class TreeView(QWidget):
         self.current_avl_delete_step = -1
         self.current_traversal_index = -1
         
-        # 禁用动画控制按钮
-        if hasattr(self, 'prev_step_button'):
-            self.prev_step_button.setEnabled(False)
-        if hasattr(self, 'next_step_button'):
-            self.next_step_button.setEnabled(False)
+        # 禁用动画控制按钮（含播放/重播，文案重置为“播放”）
+        self._set_playback_controls(False)
         
         # 停止任何正在运行的动画定时器
         if hasattr(self, 'animation_timer') and self.animation_timer.isActive():
@@ -1048,10 +1108,6 @@ class TreeView(QWidget):
             self.traversal_play_timer.stop()
         if hasattr(self, 'bst_animation_timer') and self.bst_animation_timer.isActive():
             self.bst_animation_timer.stop()
-        if hasattr(self, 'play_button'):
-            self.play_button.setEnabled(False)
-            self.replay_button.setEnabled(False)
-            self.play_button.setText("播放")
         self.traversal_is_playing = False
         
         # 更新状态
@@ -1149,21 +1205,8 @@ class TreeView(QWidget):
         # 获取选择的遍历方式
         traversal_id = self.traversal_group.checkedId()
         
-        # 设置默认遍历类型为前序遍历
-        traversal_type = "preorder"  # 默认值
-        
-        if traversal_id == 1:
-            traversal_type = "preorder"
-        elif traversal_id == 2:
-            traversal_type = "inorder"
-        elif traversal_id == 3:
-            traversal_type = "postorder"
-        elif traversal_id == 4:
-            traversal_type = "levelorder"
-        
-        # 确保遍历类型不为None
-        if not traversal_type:
-            traversal_type = "preorder"  # 如果仍然为None，使用默认值
+        # 按按钮ID查表，未选中或ID无效时默认前序遍历
+        traversal_type = self._TRAVERSAL_BY_ID[traversal_id] if 1 <= traversal_id <= 4 else "preorder"
         
         # 发射操作信号
         self.operation_triggered.emit("traverse", {
@@ -1203,7 +1246,7 @@ class TreeView(QWidget):
             return
         
         # 检查输入是否为二进制编码
-        if not all(bit in "01" for bit in code):
+        if code.translate(_BIN_STRIP):
             QMessageBox.warning(self, "警告", "请输入有效的二进制编码（只包含0和1）")
             return
         
@@ -1255,20 +1298,33 @@ class TreeView(QWidget):
         self.canvas.update_data(after_state)
 
         # 清理遍历序号以避免残留（适用于BST插入/删除及路径类操作）
-        if hasattr(self.canvas, 'current_traversal_index'):
-            self.canvas.current_traversal_index = -1
-        if hasattr(self.canvas, 'traversal_order'):
-            self.canvas.traversal_order = []
-        if hasattr(self.canvas, 'node_id_map'):
-            self.canvas.node_id_map = []
+        self.canvas.current_traversal_index = -1
+        self.canvas.traversal_order = []
+        self.canvas.node_id_map = []
+        # 重绘画布
+        self.canvas.update()
         
         # 更新状态标签
-        op_cn = {"insert": "插入", "delete": "删除"}.get(operation_type, operation_type)
+        op_cn = _OPERATION_CN.get(operation_type, operation_type)
         self.status_label.setText(f"已完成{op_cn}操作: {value}")
-        
-        # 重绘画布
-        self.canvas.update()
     
+    def _map_path_to_ids(self, path):
+        """将路径上的节点值映射为节点ID列表
+
+        相同值出现多次时按出现顺序依次取第 k 个同值节点，找不到的值跳过。
+        """
+        get = self.canvas.value_to_ids().get
+        counts = defaultdict(int)
+        node_ids = []
+        append = node_ids.append
+        for v in path:
+            ids = get(v)
+            idx = counts[v]
+            if ids and idx < len(ids):
+                append(ids[idx])
+            counts[v] = idx + 1
+        return node_ids
+
     def highlight_search_path(self, path, found, search_value=None):
         """高亮显示搜索路径
         
@@ -1280,54 +1336,22 @@ class TreeView(QWidget):
         # 获取当前数据
         data = self.canvas.data
         
-        # 将节点值转换为节点ID
-        node_ids = []
-        if data:
-            # 创建值到ID的映射（处理相同值的节点）
-            value_to_ids = {}
-            for node in data:
-                if 'value' in node and 'id' in node:
-                    if node['value'] not in value_to_ids:
-                        value_to_ids[node['value']] = []
-                    value_to_ids[node['value']].append(node['id'])
-            
-            # 跟踪已使用的节点ID
-            used_node_ids = set()
-            
-            # 获取遍历路径中每个值在树中的位置顺序
-            path_positions = {}
-            for value in path:
-                if value not in path_positions:
-                    path_positions[value] = 0
-                else:
-                    path_positions[value] += 1
-            
-            # 重置计数器用于遍历
-            value_counts = {value: 0 for value in path_positions.keys()}
-            
-            # 转换路径中的值为ID，按照遍历顺序正确映射相同值的节点
-            for value in path:
-                if value in value_to_ids and len(value_to_ids[value]) > value_counts[value]:
-                    # 按照遍历顺序获取对应的节点ID
-                    node_id = value_to_ids[value][value_counts[value]]
-                    node_ids.append(node_id)
-                    value_counts[value] += 1
-
+        # 将节点值转换为节点ID（按路径顺序正确映射相同值的节点）
+        node_ids = self._map_path_to_ids(path) if data else []
         
-        # 停止任何正在进行的动画
-        self.canvas.stop_animation()
-        # 停止AVL构建/删除动画定时器，避免与搜索播放冲突
-        self.stop_avl_animation()
+        # 停止任何正在进行的动画（含构建/删除动画定时器），避免与搜索播放冲突
+        self._cancel_all_animations()
         
         # 设置搜索数据
         self.canvas.traversal_order = path
         self.canvas.traversal_type = "search"
-        self.canvas.node_id_map = node_ids.copy()  # 使用副本避免引用问题
+        self.canvas.node_id_map = node_ids  # node_ids 为本次新建的列表，无需副本
         self.canvas.search_target = search_value  # 保存搜索目标值
         
-        # 重置动画状态
-        self.canvas.current_traversal_index = -1
-        self.canvas.highlighted_nodes = []
+        # 重置动画状态；有路径时立即显示第一个节点
+        self.canvas.current_traversal_index = 0 if node_ids else -1
+        self.canvas.highlighted_nodes = node_ids[:1]
+        self.canvas.update()
         
         # 更新状态标签
         if found:
@@ -1345,50 +1369,54 @@ class TreeView(QWidget):
             self.replay_button.setEnabled(True)
             self.play_button.setText("播放")
         
-        # 立即显示第一个节点
-        if node_ids and len(node_ids) > 0:
-            self.canvas.highlighted_nodes = [node_ids[0]]
-            self.canvas.current_traversal_index = 0
+        if node_ids:
             self.status_label.setText(f"搜索步骤: 1/{len(path)}")
-            # 强制重绘画布
-            self.canvas.update()
-            QApplication.processEvents()
-            # 自动开始播放
-            self._start_traversal_playback()
+            # 自动开始播放（交由事件循环先完成本次绘制）
+            QTimer.singleShot(0, self._start_traversal_playback)
         
+    def _run_bst_action_without_path(self, action, value):
+        """BST插入/删除没有可播放的路径时：清空路径状态、禁用播放控件并直接执行操作"""
+        self.traversal_post_action = None
+        self.canvas.stop_animation()
+        self.canvas.traversal_order = []
+        self.canvas.node_id_map = []
+        self.canvas.current_traversal_index = -1
+        self.canvas.highlighted_nodes = []
+        self._set_playback_controls(False)
+        action_cn = _OPERATION_CN[action]
+        self.status_label.setText(f"路径为空，直接{action_cn}值 {value}")
+        try:
+            self.operation_triggered.emit(action, {**self._EXEC_ONLY_BASE, 'value': value})
+        except Exception:
+            pass
+
     def highlight_bst_insert_path(self, path, value):
         """以遍历播放逻辑展示BST插入路径，并在动画结束后执行插入"""
-        data = self.canvas.data
-        node_ids = []
-        if data:
-            value_to_ids = {}
-            for node in data:
-                if 'value' in node and 'id' in node:
-                    value_to_ids.setdefault(node['value'], []).append(node['id'])
-            # 按路径顺序映射ID
-            counts = {}
-            for v in path:
-                idx = counts.get(v, 0)
-                if v in value_to_ids and idx < len(value_to_ids[v]):
-                    node_ids.append(value_to_ids[v][idx])
-                counts[v] = idx + 1
+        # 空树或空路径时结果已知，跳过映射与播放设置，直接插入
+        if not self.canvas.data or not path:
+            self._run_bst_action_without_path('insert', value)
+            return
+        # 按路径顺序映射ID
+        node_ids = self._map_path_to_ids(path)
         
-        self.canvas.stop_animation()
-        self.canvas.traversal_order = path
-        self.canvas.traversal_type = "bst_insert"
         # 为BST插入增加一个“找到插入位置”的额外步骤：重复最后一个节点ID
-        play_ids = node_ids.copy()
+        play_ids = node_ids  # 新建列表，直接追加
         if play_ids:
             play_ids.append(play_ids[-1])
+        self._cancel_all_animations()
+        self.canvas.traversal_order = path
+        self.canvas.traversal_type = "bst_insert"
         self.canvas.node_id_map = play_ids
-        self.canvas.current_traversal_index = -1
-        self.canvas.highlighted_nodes = []
+        # 有可播放路径时立即显示第一个节点
+        self.canvas.current_traversal_index = 0 if play_ids else -1
+        self.canvas.highlighted_nodes = play_ids[:1]
+        self.canvas.update()
         self.status_label.setText(f"准备BST插入路径动画：值 {value}")
         
         # 设置后置操作：动画结束后执行插入
         self.traversal_post_action = {
             'action': 'insert',
-            'params': {'value': value, 'execute_only': True}
+            'params': {**self._EXEC_ONLY_BASE, 'value': value}
         }
         
         # 播放控制
@@ -1401,57 +1429,39 @@ class TreeView(QWidget):
         
         # 若有可播放路径则按步骤播放，否则直接执行后置操作
         if play_ids:
-            self.canvas.highlighted_nodes = [play_ids[0]]
-            self.canvas.current_traversal_index = 0
             self.status_label.setText(f"BST插入路径步骤: 1/{len(self.canvas.node_id_map)}")
-            self.canvas.update()
-            QApplication.processEvents()
-            self._start_traversal_playback()
+            QTimer.singleShot(0, self._start_traversal_playback)
         else:
             # 无路径（如空树）时直接触发插入，避免因为node_id_map为空无法执行后置操作
-            self.prev_step_button.setEnabled(False)
-            self.next_step_button.setEnabled(False)
-            if hasattr(self, 'play_button'):
-                self.play_button.setEnabled(False)
-                self.replay_button.setEnabled(False)
-                self.play_button.setText("播放")
-            self.status_label.setText(f"路径为空，直接插入值 {value}")
-            try:
-                self.operation_triggered.emit('insert', {'value': value, 'execute_only': True})
-            except Exception:
-                pass
+            self._run_bst_action_without_path('insert', value)
+
     def highlight_bst_delete_path(self, path, value):
         """以遍历播放逻辑展示BST删除路径，并在动画结束后执行删除"""
-        data = self.canvas.data
-        node_ids = []
-        if data:
-            value_to_ids = {}
-            for node in data:
-                if 'value' in node and 'id' in node:
-                    value_to_ids.setdefault(node['value'], []).append(node['id'])
-            counts = {}
-            for v in path:
-                idx = counts.get(v, 0)
-                if v in value_to_ids and idx < len(value_to_ids[v]):
-                    node_ids.append(value_to_ids[v][idx])
-                counts[v] = idx + 1
+        # 空树或空路径时结果已知，跳过映射与播放设置，直接删除
+        if not self.canvas.data or not path:
+            self._run_bst_action_without_path('delete', value)
+            return
+        # 按路径顺序映射ID
+        node_ids = self._map_path_to_ids(path)
         
-        self.canvas.stop_animation()
-        self.canvas.traversal_order = path
-        self.canvas.traversal_type = "bst_delete"
         # 为BST删除增加一个“定位到要删除的节点”的额外步骤：重复最后一个节点ID
-        play_ids = node_ids.copy()
+        play_ids = node_ids  # 新建列表，直接追加
         if play_ids:
             play_ids.append(play_ids[-1])
+        self._cancel_all_animations()
+        self.canvas.traversal_order = path
+        self.canvas.traversal_type = "bst_delete"
         self.canvas.node_id_map = play_ids
-        self.canvas.current_traversal_index = -1
-        self.canvas.highlighted_nodes = []
+        # 有可播放路径时立即显示第一个节点
+        self.canvas.current_traversal_index = 0 if play_ids else -1
+        self.canvas.highlighted_nodes = play_ids[:1]
+        self.canvas.update()
         self.status_label.setText(f"准备BST删除路径动画：值 {value}")
         
         # 设置后置操作：动画结束后执行删除
         self.traversal_post_action = {
             'action': 'delete',
-            'params': {'value': value, 'execute_only': True}
+            'params': {**self._EXEC_ONLY_BASE, 'value': value}
         }
         
         self.prev_step_button.setEnabled(True)
@@ -1463,28 +1473,33 @@ class TreeView(QWidget):
         
         # 若有可播放路径则按步骤播放，否则直接执行后置操作
         if play_ids:
-            self.canvas.highlighted_nodes = [play_ids[0]]
-            self.canvas.current_traversal_index = 0
             self.status_label.setText(f"BST删除路径步骤: 1/{len(self.canvas.node_id_map)}")
-            self.canvas.update()
-            QApplication.processEvents()
-            self._start_traversal_playback()
+            QTimer.singleShot(0, self._start_traversal_playback)
         else:
             # 无路径（如值不存在或空树）时直接触发删除，避免因为node_id_map为空无法执行后置操作
-            self.prev_step_button.setEnabled(False)
-            self.next_step_button.setEnabled(False)
-            if hasattr(self, 'play_button'):
-                self.play_button.setEnabled(False)
-                self.replay_button.setEnabled(False)
-                self.play_button.setText("播放")
-            self.status_label.setText(f"路径为空，直接删除值 {value}")
-            try:
-                self.operation_triggered.emit('delete', {'value': value, 'execute_only': True})
-            except Exception:
-                pass
+            self._run_bst_action_without_path('delete', value)
+
+    def _update_step_status(self, idx):
+        """按遍历类型为第 idx 步设置状态标签（上一步/下一步/时间轴拖动共用）"""
+        if self.canvas.traversal_type in ("bst_insert", "bst_delete"):
+            action_cn = self._BST_ACTION_CN[self.canvas.traversal_type]
+            total_steps = len(self.canvas.node_id_map)
+            self.status_label.setText(f"{action_cn}: {idx + 1}/{total_steps}")
+        elif self.canvas.traversal_type == "search":
+            self.status_label.setText(f"搜索步骤: {idx + 1}/{len(self.canvas.traversal_order)}")
+        elif self.canvas.traversal_type in ("huffman_encode", "huffman_decode"):
+            texts = self.huffman_status_strings
+            if 0 <= idx < len(texts):
+                self.status_label.setText(texts[idx])
+            else:
+                self.status_label.setText(f"哈夫曼路径步骤: {idx + 1}/{len(self.canvas.node_id_map)}")
+        else:
+            traversal_name = self._TRAVERSAL_CN.get(self.canvas.traversal_type, self.canvas.traversal_type)
+            self.status_label.setText(f"{traversal_name}遍历步骤: {idx + 1}/{len(self.canvas.traversal_order)}")
+
     def _prev_traversal_step(self):
         """处理上一步按钮点击事件"""
-        if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+        if not self.canvas.node_id_map:
             return
             
         # 更新当前遍历索引
@@ -1498,50 +1513,14 @@ class TreeView(QWidget):
                 self._sync_slider_with_index()
                 
                 # 更新状态标签
-                if self.canvas.traversal_type in ("bst_insert", "bst_delete"):
-                    action_cn = "BST插入路径步骤" if self.canvas.traversal_type == "bst_insert" else "BST删除路径步骤"
-                    total_steps = len(self.canvas.node_id_map)
-                    self.status_label.setText(f"{action_cn}: {self.canvas.current_traversal_index + 1}/{total_steps}")
-                elif self.canvas.traversal_type == "search":
-                    self.status_label.setText(f"搜索步骤: {self.canvas.current_traversal_index + 1}/{len(self.canvas.traversal_order)}")
-                elif self.canvas.traversal_type in ("huffman_encode", "huffman_decode"):
-                    info = None
-                    try:
-                        if hasattr(self, 'huffman_step_info') and self.huffman_step_info:
-                            info = self.huffman_step_info[self.canvas.current_traversal_index]
-                    except Exception:
-                        info = None
-                    if self.canvas.traversal_type == "huffman_encode" and info:
-                        self.status_label.setText(
-                            f"哈夫曼编码：字符 '{info.get('char')}' 步骤 {info.get('step_in_char')}/{info.get('total_char_steps')}（位 {info.get('bit')}）"
-                        )
-                    elif self.canvas.traversal_type == "huffman_decode" and info:
-                        if info.get('recognized_char'):
-                            self.status_label.setText(
-                                f"哈夫曼解码：位 {info.get('bit')}，累积 {info.get('accum_code')} -> 识别 '{info.get('recognized_char')}'"
-                            )
-                        else:
-                            self.status_label.setText(
-                                f"哈夫曼解码：位 {info.get('bit')}，累积 {info.get('accum_code')}"
-                            )
-                    else:
-                        self.status_label.setText(f"哈夫曼路径步骤: {self.canvas.current_traversal_index + 1}/{len(self.canvas.node_id_map)}")
-                else:
-                    traversal_name = {
-                        "preorder": "前序遍历",
-                        "inorder": "中序遍历",
-                        "postorder": "后序遍历",
-                        "levelorder": "层序遍历"
-                    }.get(self.canvas.traversal_type, self.canvas.traversal_type)
-                    self.status_label.setText(f"{traversal_name}遍历步骤: {self.canvas.current_traversal_index + 1}/{len(self.canvas.traversal_order)}")
+                self._update_step_status(self.canvas.current_traversal_index)
                 
-                # 强制重绘画布
+                # 请求重绘画布（由Qt合并绘制）
                 self.canvas.update()
-                QApplication.processEvents()
     
     def _next_traversal_step(self):
         """处理下一步按钮点击事件"""
-        if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+        if not self.canvas.node_id_map:
             return
             
         # 更新当前遍历索引
@@ -1555,46 +1534,10 @@ class TreeView(QWidget):
                 self._sync_slider_with_index()
                 
                 # 更新状态标签
-                if self.canvas.traversal_type in ("bst_insert", "bst_delete"):
-                    action_cn = "BST插入路径步骤" if self.canvas.traversal_type == "bst_insert" else "BST删除路径步骤"
-                    total_steps = len(self.canvas.node_id_map)
-                    self.status_label.setText(f"{action_cn}: {self.canvas.current_traversal_index + 1}/{total_steps}")
-                elif self.canvas.traversal_type == "search":
-                    self.status_label.setText(f"搜索步骤: {self.canvas.current_traversal_index + 1}/{len(self.canvas.traversal_order)}")
-                elif self.canvas.traversal_type in ("huffman_encode", "huffman_decode"):
-                    info = None
-                    try:
-                        if hasattr(self, 'huffman_step_info') and self.huffman_step_info:
-                            info = self.huffman_step_info[self.canvas.current_traversal_index]
-                    except Exception:
-                        info = None
-                    if self.canvas.traversal_type == "huffman_encode" and info:
-                        self.status_label.setText(
-                            f"哈夫曼编码：字符 '{info.get('char')}' 步骤 {info.get('step_in_char')}/{info.get('total_char_steps')}（位 {info.get('bit')}）"
-                        )
-                    elif self.canvas.traversal_type == "huffman_decode" and info:
-                        if info.get('recognized_char'):
-                            self.status_label.setText(
-                                f"哈夫曼解码：位 {info.get('bit')}，累积 {info.get('accum_code')} -> 识别 '{info.get('recognized_char')}'"
-                            )
-                        else:
-                            self.status_label.setText(
-                                f"哈夫曼解码：位 {info.get('bit')}，累积 {info.get('accum_code')}"
-                            )
-                    else:
-                        self.status_label.setText(f"哈夫曼路径步骤: {self.canvas.current_traversal_index + 1}/{len(self.canvas.node_id_map)}")
-                else:
-                    traversal_name = {
-                        "preorder": "前序遍历",
-                        "inorder": "中序遍历",
-                        "postorder": "后序遍历",
-                        "levelorder": "层序遍历"
-                    }.get(self.canvas.traversal_type, self.canvas.traversal_type)
-                    self.status_label.setText(f"{traversal_name}遍历步骤: {self.canvas.current_traversal_index + 1}/{len(self.canvas.traversal_order)}")
+                self._update_step_status(self.canvas.current_traversal_index)
                 
-                # 强制重绘画布
+                # 请求重绘画布（由Qt合并绘制）
                 self.canvas.update()
-                QApplication.processEvents()
             
             # 检查是否完成遍历或搜索
             if self.canvas.current_traversal_index >= len(self.canvas.node_id_map) - 1:
@@ -1606,7 +1549,7 @@ class TreeView(QWidget):
                     self.prev_step_button.setEnabled(False)
                     self.next_step_button.setEnabled(False)
                     self._pause_traversal_playback()
-                    action_cn = {'insert': '插入', 'delete': '删除'}.get(post.get('action'), post.get('action'))
+                    action_cn = _OPERATION_CN.get(post.get('action'), post.get('action'))
                     self.status_label.setText(f"路径动画完成，执行{action_cn}操作…")
                     try:
                         self.operation_triggered.emit(post['action'], post.get('params', {}))
@@ -1616,8 +1559,8 @@ class TreeView(QWidget):
                 
                 # 动画完成，显示结果弹窗（针对标准搜索/遍历；哈夫曼不弹窗）
                 if self.canvas.traversal_type == "search":
-                    found = self.canvas.traversal_order[-1] == self.canvas.search_target if hasattr(self.canvas, 'search_target') else False
-                    result = {'found': found, 'value': self.canvas.search_target if hasattr(self.canvas, 'search_target') else None}
+                    found = self.canvas.traversal_order[-1] == self.canvas.search_target
+                    result = {'found': found, 'value': self.canvas.search_target}
                     self.show_result("search", result)
                 elif self.canvas.traversal_type in {"preorder", "inorder", "postorder", "levelorder"}:
                     result = {'result': self.canvas.traversal_order}
@@ -1625,10 +1568,11 @@ class TreeView(QWidget):
                 elif self.canvas.traversal_type == "huffman_decode":
                     # 完成信息由播放tick或此处设置为更友好文案
                     final_text = getattr(self, 'huffman_decoded_text', None)
+                    note = getattr(self, 'huffman_truncation_note', "")
                     if final_text is not None:
-                        self.status_label.setText(f"哈夫曼解码完成：{final_text}")
+                        self.status_label.setText(f"哈夫曼解码完成：{final_text}{note}")
                     else:
-                        self.status_label.setText("哈夫曼解码完成")
+                        self.status_label.setText(f"哈夫曼解码完成{note}")
                 elif self.canvas.traversal_type == "huffman_encode":
                     self.status_label.setText("哈夫曼编码路径播放完成")
                 
@@ -1646,57 +1590,24 @@ class TreeView(QWidget):
         # 获取当前数据
         data = self.canvas.data
         
-        # 将节点值转换为节点ID
-        node_ids = []
-        if data:
-            # 创建值到ID列表的映射
-            value_to_ids = {}
-            for node in data:
-                if 'value' in node and 'id' in node:
-                    if node['value'] not in value_to_ids:
-                        value_to_ids[node['value']] = []
-                    value_to_ids[node['value']].append(node['id'])
-            
-            # 记录已使用的节点ID
-            used_ids = set()
-            
-            # 为每个遍历路径中的值找到合适的节点ID
-            for value in path:
-                if value in value_to_ids and value_to_ids[value]:
-                    # 尝试找到一个未使用的ID
-                    found_unused = False
-                    for node_id in value_to_ids[value]:
-                        if node_id not in used_ids:
-                            node_ids.append(node_id)
-                            used_ids.add(node_id)
-                            found_unused = True
-                            print(f"映射节点值 {value} 到未使用的ID {node_id}")
-                            break
-                    
-                    # 如果所有ID都已使用，则重用第一个ID
-                    if not found_unused and value_to_ids[value]:
-                        node_id = value_to_ids[value][0]
-                        node_ids.append(node_id)
+        # 将节点值转换为节点ID（按路径顺序正确映射相同值的节点）
+        node_ids = self._map_path_to_ids(path) if data else []
         
         # 停止任何正在进行的动画
-        self.canvas.stop_animation()
+        self._cancel_all_animations()
         
         # 设置遍历数据
         self.canvas.traversal_order = path
         self.canvas.traversal_type = traverse_type
-        self.canvas.node_id_map = node_ids.copy()  # 使用副本避免引用问题
+        self.canvas.node_id_map = node_ids  # node_ids 为本次新建的列表，无需副本
         
-        # 重置动画状态
-        self.canvas.current_traversal_index = -1
-        self.canvas.highlighted_nodes = []
+        # 重置动画状态；有路径时立即显示第一个节点
+        self.canvas.current_traversal_index = 0 if node_ids else -1
+        self.canvas.highlighted_nodes = node_ids[:1]
+        self.canvas.update()
         
         # 更新状态标签
-        traversal_name = {
-            "preorder": "前序遍历",
-            "inorder": "中序遍历",
-            "postorder": "后序遍历",
-            "levelorder": "层序遍历"
-        }.get(traverse_type, traverse_type)
+        traversal_name = self._TRAVERSAL_CN.get(traverse_type, traverse_type)
         self.status_label.setText(f"准备{traversal_name}手动遍历...")
         
         # 启用遍历控制按钮
@@ -1709,18 +1620,12 @@ class TreeView(QWidget):
             self.replay_button.setEnabled(True)
             self.play_button.setText("播放")
         
-        # 立即显示第一个节点
-        if node_ids and len(node_ids) > 0:
-            self.canvas.highlighted_nodes = [node_ids[0]]
-            self.canvas.current_traversal_index = 0
+        if node_ids:
             # 配置时间轴滑块范围与当前位置
             self._configure_timeline_slider()
             self.status_label.setText(f"{traversal_name}遍历步骤: 1/{len(path)}")
-            # 强制重绘画布
-            self.canvas.update()
-            QApplication.processEvents()
-            # 自动开始播放
-            self._start_traversal_playback()
+            # 自动开始播放（交由事件循环先完成本次绘制）
+            QTimer.singleShot(0, self._start_traversal_playback)
     
     def show_huffman_build_animation(self, build_steps):
         """显示哈夫曼树构建过程的动画
@@ -1807,6 +1712,12 @@ class TreeView(QWidget):
         # 设置构建步骤数据
         self.bst_build_steps = build_steps
         self.current_bst_step = 0
+        # 每步状态文案只生成一次，播放/拖动时按下标取用
+        n = len(build_steps)
+        self._bst_step_statuses = [
+            f"步骤 {i + 1}/{n}: {step.get('description') or step.get('action') or f'步骤 {i + 1}'}"
+            for i, step in enumerate(build_steps)
+        ]
         
         # 更新状态标签
         self.status_label.setText(f"BST构建动画开始，共{len(build_steps)}步")
@@ -1831,12 +1742,7 @@ class TreeView(QWidget):
             return
         
         # 停止其他动画，避免冲突
-        if hasattr(self, 'huffman_animation_timer') and self.huffman_animation_timer.isActive():
-            self.huffman_animation_timer.stop()
-        if hasattr(self, 'avl_animation_timer') and self.avl_animation_timer.isActive():
-            self.avl_animation_timer.stop()
-        if hasattr(self, 'bst_animation_timer') and self.bst_animation_timer.isActive():
-            self.bst_animation_timer.stop()
+        self._cancel_all_animations()
         
         # 初始化动画状态
         self.current_bst_step = 0
@@ -1867,12 +1773,7 @@ class TreeView(QWidget):
     def start_bst_delete_animation(self):
         if not getattr(self, 'bst_delete_steps', []):
             return
-        if hasattr(self, 'huffman_animation_timer') and self.huffman_animation_timer.isActive():
-            self.huffman_animation_timer.stop()
-        if hasattr(self, 'avl_animation_timer') and self.avl_animation_timer.isActive():
-            self.avl_animation_timer.stop()
-        if hasattr(self, 'bst_animation_timer') and self.bst_animation_timer.isActive():
-            self.bst_animation_timer.stop()
+        self._cancel_all_animations()
         try:
             if hasattr(self, 'traversal_play_timer') and self.traversal_play_timer.isActive():
                 self.traversal_play_timer.stop()
@@ -1951,8 +1852,7 @@ class TreeView(QWidget):
         step_data = self.bst_build_steps[step_index]
         
         # 更新状态标签
-        description = step_data.get('description') or step_data.get('action') or f"步骤 {step_index + 1}"
-        self.status_label.setText(f"步骤 {step_index + 1}/{len(self.bst_build_steps)}: {description}")
+        self.status_label.setText(self._bst_step_statuses[step_index])
         
         # 准备可视化数据
         visualization_data = {
@@ -2225,9 +2125,7 @@ class TreeView(QWidget):
         elif hasattr(self, 'huffman_build_steps') and self.huffman_build_steps:
             self._prev_huffman_step()
         # 最后检查遍历和搜索动画
-        elif hasattr(self.canvas, 'traversal_order') and hasattr(self.canvas, 'traversal_type'):
-            self._prev_traversal_step()
-        elif hasattr(self.canvas, 'search_target'):
+        else:
             self._prev_traversal_step()  # 搜索动画也使用遍历步骤控制
 
     def _next_step(self):
@@ -2246,9 +2144,7 @@ class TreeView(QWidget):
         elif hasattr(self, 'huffman_build_steps') and self.huffman_build_steps:
             self._next_huffman_step()
         # 最后检查遍历和搜索动画
-        elif hasattr(self.canvas, 'traversal_order') and hasattr(self.canvas, 'traversal_type'):
-            self._next_traversal_step()
-        elif hasattr(self.canvas, 'search_target'):
+        else:
             self._next_traversal_step()  # 搜索动画也使用遍历步骤控制
     
     def _prev_huffman_step(self):
@@ -2986,7 +2882,7 @@ class TreeView(QWidget):
     # —— 二叉树遍历播放控制（仿线性表）——
     def _on_traversal_timer_tick(self):
         """计时器推进遍历步骤"""
-        if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+        if not self.canvas.node_id_map:
             self._pause_traversal_playback()
             return
         self._next_traversal_step()
@@ -2994,10 +2890,10 @@ class TreeView(QWidget):
         if self.canvas.current_traversal_index >= len(self.canvas.node_id_map) - 1:
             self._pause_traversal_playback()
             # 对哈夫曼播放，保留步骤函数设置的完成文案
-            if getattr(self.canvas, 'traversal_type', None) in ("huffman_encode", "huffman_decode"):
+            if self.canvas.traversal_type in ("huffman_encode", "huffman_decode"):
                 return
             # 若为搜索动画，结束后清理步骤状态与按钮，避免残留序号
-            if getattr(self.canvas, 'traversal_type', None) == "search":
+            if self.canvas.traversal_type == "search":
                 try:
                     self.canvas.current_traversal_index = -1
                     self.canvas.highlighted_nodes = []
@@ -3032,7 +2928,8 @@ class TreeView(QWidget):
             if getattr(self, 'replay_in_progress', False) and hasattr(self, 'last_operation_after_state') and self.last_operation_after_state:
                 try:
                     self.canvas.update_data(self.last_operation_after_state)
-                    op_cn = {"insert": "插入", "delete": "删除"}.get(getattr(self, 'last_operation_type', ''), getattr(self, 'last_operation_type', ''))
+                    op_type = getattr(self, 'last_operation_type', '')
+                    op_cn = _OPERATION_CN.get(op_type, op_type)
                     val = getattr(self, 'last_operation_value', None)
                     if val is not None:
                         self.status_label.setText(f"已完成{op_cn}操作: {val}")
@@ -3060,10 +2957,11 @@ class TreeView(QWidget):
 
     def _start_traversal_playback(self):
         """开始自动播放遍历"""
-        if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+        if not self.canvas.node_id_map:
             return
         self.traversal_is_playing = True
         self.play_button.setText("暂停")
+        # 总是重新 start：新路径的第一步需从完整间隔开始计时，不能沿用旧播放的相位
         self.traversal_play_timer.start(self._current_traversal_interval_ms())
         self.status_label.setText("播放中……")
 
@@ -3146,7 +3044,7 @@ class TreeView(QWidget):
             return
         
         # 若处于AVL构建/删除动画场景，控制AVL定时器（搜索场景优先使用遍历播放）
-        if getattr(self.canvas, 'traversal_type', None) != "search" and ((hasattr(self, 'avl_delete_steps') and self.avl_delete_steps) or (hasattr(self, 'avl_build_steps') and self.avl_build_steps)):
+        if self.canvas.traversal_type != "search" and ((hasattr(self, 'avl_delete_steps') and self.avl_delete_steps) or (hasattr(self, 'avl_build_steps') and self.avl_build_steps)):
             total_steps = len(self.avl_delete_steps) if getattr(self, 'avl_delete_steps', []) else len(self.avl_build_steps)
             if getattr(self, 'current_avl_step', 0) >= total_steps:
                 self.stop_avl_animation()
@@ -3170,7 +3068,7 @@ class TreeView(QWidget):
             return
         
         # 默认：控制遍历播放
-        if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+        if not self.canvas.node_id_map:
             return
         # 到达末尾则重播
         if self.canvas.current_traversal_index >= len(self.canvas.node_id_map) - 1:
@@ -3224,7 +3122,7 @@ class TreeView(QWidget):
         # 若最近一次新建为BST且缓存了值序列，则在“无路径且最近操作为新建/构建”时重触发批量构建
         try:
             recent_op = getattr(self, 'last_operation_type', None)
-            has_path = hasattr(self.canvas, 'node_id_map') and bool(self.canvas.node_id_map)
+            has_path = bool(self.canvas.node_id_map)
             if (
                 not has_path and
                 (recent_op is None or recent_op in ('create', 'build_bst')) and
@@ -3240,7 +3138,7 @@ class TreeView(QWidget):
             pass
         
         # 若为AVL构建/删除动画，执行重播并返回（搜索场景优先用遍历重播）
-        if getattr(self.canvas, 'traversal_type', None) != "search" and ((hasattr(self, 'avl_delete_steps') and self.avl_delete_steps) or (hasattr(self, 'avl_build_steps') and self.avl_build_steps)):
+        if self.canvas.traversal_type != "search" and ((hasattr(self, 'avl_delete_steps') and self.avl_delete_steps) or (hasattr(self, 'avl_build_steps') and self.avl_build_steps)):
             self.stop_avl_animation()
             if getattr(self, 'avl_delete_steps', []):
                 self.start_avl_delete_animation()
@@ -3255,7 +3153,7 @@ class TreeView(QWidget):
         if hasattr(self.canvas, 'stop_animation'):
             self.canvas.stop_animation()
         # 若没有可播放路径，尝试基于最近一次操作的“前态”重建路径后自动播放
-        if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+        if not self.canvas.node_id_map:
             if hasattr(self, 'last_operation_before_state') and self.last_operation_before_state:
                 try:
                     before = self.last_operation_before_state
@@ -3391,7 +3289,7 @@ class TreeView(QWidget):
                         # 非BST插入/删除或无节点数据：仅恢复前态
                         self.replay_in_progress = True
                         self.canvas.update_data(before)
-                        op_cn = {"insert": "插入", "delete": "删除"}.get(op_type, op_type)
+                        op_cn = _OPERATION_CN.get(op_type, op_type)
                         if op_val is not None:
                             self.status_label.setText(f"重播：先显示{op_cn}前状态（值 {op_val}）")
                         else:
@@ -3403,11 +3301,11 @@ class TreeView(QWidget):
             return
         # 若当前是BST路径动画且有最近一次操作的前态，则先恢复并标记重播模式
         try:
-            if getattr(self.canvas, 'traversal_type', None) in ("bst_insert", "bst_delete") and \
+            if self.canvas.traversal_type in ("bst_insert", "bst_delete") and \
                hasattr(self, 'last_operation_before_state') and self.last_operation_before_state:
                 self.replay_in_progress = True
                 self.canvas.update_data(self.last_operation_before_state)
-                op_cn = "插入" if getattr(self.canvas, 'traversal_type', None) == "bst_insert" else "删除"
+                op_cn = "插入" if self.canvas.traversal_type == "bst_insert" else "删除"
                 val = getattr(self, 'last_operation_value', None)
                 if val is not None:
                     self.status_label.setText(f"重播：先显示{op_cn}前状态（值 {val}），随后自动播放")
@@ -3464,8 +3362,8 @@ class TreeView(QWidget):
                 total = len(self.bst_delete_steps)
                 cur = max(0, getattr(self, 'current_bst_delete_step', 0))
             else:
-                total = len(self.canvas.node_id_map) if hasattr(self.canvas, 'node_id_map') else 0
-                cur = max(0, getattr(self.canvas, 'current_traversal_index', 0))
+                total = len(self.canvas.node_id_map)
+                cur = max(0, self.canvas.current_traversal_index)
             self._updating_slider = True
             self.timeline_slider.setEnabled(total > 0)
             self.timeline_slider.setMinimum(0)
@@ -3481,7 +3379,7 @@ class TreeView(QWidget):
         try:
             if not hasattr(self, 'timeline_slider'):
                 return
-            if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+            if not self.canvas.node_id_map:
                 return
             self._updating_slider = True
             self.timeline_slider.setEnabled(True)
@@ -3593,7 +3491,7 @@ class TreeView(QWidget):
                 except Exception:
                     pass
                 return
-            if not hasattr(self.canvas, 'node_id_map') or not self.canvas.node_id_map:
+            if not self.canvas.node_id_map:
                 return
             # 拖动时暂停自动播放，避免相互竞态
             self._pause_traversal_playback()
@@ -3605,41 +3503,7 @@ class TreeView(QWidget):
 
             # 更新状态标签（针对不同遍历类型文案）
             try:
-                if self.canvas.traversal_type in ("bst_insert", "bst_delete"):
-                    action_cn = "BST插入路径步骤" if self.canvas.traversal_type == "bst_insert" else "BST删除路径步骤"
-                    self.status_label.setText(f"{action_cn}: {idx + 1}/{len(self.canvas.node_id_map)}")
-                elif self.canvas.traversal_type == "search":
-                    self.status_label.setText(f"搜索步骤: {idx + 1}/{len(self.canvas.traversal_order)}")
-                elif self.canvas.traversal_type in ("huffman_encode", "huffman_decode"):
-                    info = None
-                    try:
-                        if hasattr(self, 'huffman_step_info') and self.huffman_step_info:
-                            info = self.huffman_step_info[idx]
-                    except Exception:
-                        info = None
-                    if self.canvas.traversal_type == "huffman_encode" and info:
-                        self.status_label.setText(
-                            f"哈夫曼编码：字符 '{info.get('char')}' 步骤 {info.get('step_in_char')}/{info.get('total_char_steps')}（位 {info.get('bit')}）"
-                        )
-                    elif self.canvas.traversal_type == "huffman_decode" and info:
-                        if info.get('recognized_char'):
-                            self.status_label.setText(
-                                f"哈夫曼解码：位 {info.get('bit')}，累积 {info.get('accum_code')} -> 识别 '{info.get('recognized_char')}'"
-                            )
-                        else:
-                            self.status_label.setText(
-                                f"哈夫曼解码：位 {info.get('bit')}，累积 {info.get('accum_code')}"
-                            )
-                    else:
-                        self.status_label.setText(f"哈夫曼路径步骤: {idx + 1}/{len(self.canvas.node_id_map)}")
-                else:
-                    traversal_name = {
-                        "preorder": "前序遍历",
-                        "inorder": "中序遍历",
-                        "postorder": "后序遍历",
-                        "levelorder": "层序遍历"
-                    }.get(self.canvas.traversal_type, self.canvas.traversal_type)
-                    self.status_label.setText(f"{traversal_name}遍历步骤: {idx + 1}/{len(self.canvas.traversal_order)}")
+                self._update_step_status(idx)
             except Exception:
                 pass
 
@@ -3668,6 +3532,14 @@ class TreeCanvas(QWidget):
         # 初始化数据
         self.data = None
         self.structure_type = None
+        # 数据版本：每次替换 data 时递增，用于失效基于 data 派生的缓存
+        self._data_version = 0
+        self._huffman_index_version = -1
+        self._huffman_index = None
+        self._huffman_paths_version = -1
+        self._huffman_char_paths = None
+        self._value_to_ids_version = -1
+        self._value_to_ids = None
         
         # 节点样式
         self.node_radius = 20
@@ -3688,10 +3560,12 @@ class TreeCanvas(QWidget):
         self.hovered_node_id = None
         self.selected_node_id = None
         
-        # 遍历相关
+        # 遍历相关（视图的高亮/播放逻辑直接读写这些属性，须始终存在）
         self.traversal_order = []
         self.traversal_type = None
         self.current_traversal_index = -1
+        self.node_id_map = []
+        self.search_target = None
         
         # 动画定时器
         self.animation_timer = QTimer()
@@ -3811,8 +3685,14 @@ class TreeCanvas(QWidget):
             data: 可视化数据，包含结构类型和节点
         """
 
-        # 更新数据
-        self.data = data.get("nodes", [])
+        # 更新数据：逐个复制节点字典，下面的规范化与 AVL 坐标计算只写画布自己的副本，
+        # 不改动调用方的数据（视图缓存的可视化数据、构建步骤快照可能被重复传入）
+        self.data = [dict(node) for node in data.get("nodes", [])]
+        # 规范化父节点字段：统一为 parent_id（兼容仅提供 parent 的数据），后续遍历只需一次查找
+        for node in self.data:
+            if node.get('parent_id') is None:
+                node['parent_id'] = node.get('parent')
+        self._data_version += 1
         self.structure_type = data.get("type")
         self.highlighted_nodes = data.get("highlighted", [])
         
@@ -3823,6 +3703,61 @@ class TreeCanvas(QWidget):
         # 触发重绘
         self.update()
 
+    def value_to_ids(self):
+        """返回 节点值 -> 节点ID列表（按数据顺序，处理相同值的节点），按数据版本缓存"""
+        if self._value_to_ids_version != self._data_version:
+            # defaultdict 每个节点只需一次键查找；调用方只用 get 读取，不会误插入空键
+            value_to_ids = defaultdict(list)
+            for node in self.data or []:
+                if 'value' in node and 'id' in node:
+                    value_to_ids[node['value']].append(node['id'])
+            self._value_to_ids = value_to_ids
+            self._value_to_ids_version = self._data_version
+        return self._value_to_ids
+
+    def huffman_index(self):
+        """返回哈夫曼树的查找表 (id_map, char_leaf_id, parent_of)
+
+        id_map: 节点ID -> 节点；char_leaf_id: 字符 -> 叶子ID；parent_of: 节点ID -> 父节点ID。
+        按数据版本缓存，同一棵树上的多次编码/解码无需重复构建。
+        """
+        if self._huffman_index_version != self._data_version:
+            id_map = {}
+            char_leaf_id = {}
+            parent_of = {}
+            for node in self.data or []:
+                nid = node.get('id')
+                if nid is None:
+                    continue
+                id_map[nid] = node
+                ch = node.get('char')
+                if ch is not None:
+                    char_leaf_id[ch] = nid
+                parent_id = node['parent_id']
+                if parent_id is not None:
+                    parent_of[nid] = parent_id
+            self._huffman_index = (id_map, char_leaf_id, parent_of)
+            self._huffman_index_version = self._data_version
+        return self._huffman_index
+
+    def huffman_char_paths(self):
+        """返回 字符 -> 根到叶子的节点ID路径（含根），按数据版本缓存"""
+        if self._huffman_paths_version != self._data_version:
+            _, char_leaf_id, parent_of = self.huffman_index()
+            char_paths = {}
+            for ch, leaf_id in char_leaf_id.items():
+                # 叶->根，随后反转得到根->叶路径
+                path = [leaf_id]
+                parent_id = parent_of.get(leaf_id)
+                while parent_id is not None:
+                    path.append(parent_id)
+                    parent_id = parent_of.get(parent_id)
+                path.reverse()
+                char_paths[ch] = path
+            self._huffman_char_paths = char_paths
+            self._huffman_paths_version = self._data_version
+        return self._huffman_char_paths
+
     def _find_tree_view(self):
         parent = self.parent()
         while parent is not None: